@@ -1,14 +1,17 @@
 """Agent nodes for course building."""
-from .researcher_agent import researcher_agent
+from .researcher_agent import researcher_agent, researcher_agent_async, researcher_agent_batch
 from .module_structure_agent import module_structure_agent
-from .xdp_agent import xdp_agent
+from .xdp_agent import xdp_agent, xdp_agent_async
 from .course_content_agent import course_content_agent
 from .quiz_curator_agent import quiz_curator_agent
 
 __all__ = [
     "researcher_agent",
+    "researcher_agent_async",
+    "researcher_agent_batch",
     "module_structure_agent",
     "xdp_agent",
+    "xdp_agent_async",
     "course_content_agent",
     "quiz_curator_agent"
 ]
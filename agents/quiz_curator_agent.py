@@ -4,7 +4,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from utils.gemini_llm import GeminiLLM
 from utils.config import GOOGLE_API_KEY, GEMINI_MODEL, GEMINI_TEMPERATURE
-from utils.results_saver import ResultsSaver
+from utils.results_saver import get_saver
 from utils.progress_tracker import ProgressTracker
 from utils.prompt_helpers import create_feedback_preparer, create_prompt_formatter, create_json_parser
 from state.base_state import CourseState
@@ -252,7 +252,7 @@ Return JSON format similar to graded quiz but with quiz_type: "practice".{regene
         state["quizzes"] = all_quizzes
         
         # Save results
-        saver = ResultsSaver()
+        saver = get_saver()
         saver.save_quizzes(all_quizzes, thread_id)
         
         graded = len([q for q in all_quizzes if q.get("quiz_type") == "graded"])
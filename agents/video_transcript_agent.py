@@ -4,7 +4,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from utils.gemini_llm import GeminiLLM
 from utils.config import GOOGLE_API_KEY, GEMINI_MODEL, GEMINI_TEMPERATURE
-from utils.results_saver import ResultsSaver
+from utils.results_saver import get_saver
 from utils.progress_tracker import ProgressTracker
 from utils.duration_calculator import calculate_video_durations
 from utils.prompt_helpers import create_json_parser
@@ -14,6 +14,13 @@ import json
 import re
 from datetime import datetime
 
+# Compiled once at import - these run per lesson (and per retry) in the
+# transcript loop, so avoid re-parsing the patterns on every call.
+_TRANSCRIPT_OBJ_RE = re.compile(r'\{[^{}]*"transcript"[^{}]*\}', re.DOTALL)
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+_TRANSCRIPT_FIELD_RE = re.compile(r'"transcript"\s*:\s*"([^"]+)"', re.DOTALL)
+_TRANSCRIPT_LOOSE_RE = re.compile(r'transcript["\']?\s*:\s*["\']([^"\']+)["\']', re.DOTALL)
+
 
 def format_list_field(items: list) -> str:
     """
@@ -174,12 +181,12 @@ Summary: {lesson_content_data.get('summary', '')}
             result = {}
             try:
                 # First try direct JSON parsing
-                json_match = re.search(r'\{[^{}]*"transcript"[^{}]*\}', response_content, re.DOTALL)
+                json_match = _TRANSCRIPT_OBJ_RE.search(response_content)
                 if json_match:
                     result = json.loads(json_match.group())
                 else:
                     # Try to find JSON block
-                    json_match = re.search(r'\{.*\}', response_content, re.DOTALL)
+                    json_match = _JSON_RE.search(response_content)
                     if json_match:
                         result = json.loads(json_match.group())
                     else:
@@ -188,9 +195,9 @@ Summary: {lesson_content_data.get('summary', '')}
             except (json.JSONDecodeError, Exception) as parse_error:
                 # If JSON parsing fails, try to extract transcript from text
                 # Look for transcript field in various formats
-                transcript_match = re.search(r'"transcript"\s*:\s*"([^"]+)"', response_content, re.DOTALL)
+                transcript_match = _TRANSCRIPT_FIELD_RE.search(response_content)
                 if not transcript_match:
-                    transcript_match = re.search(r'transcript["\']?\s*:\s*["\']([^"\']+)["\']', response_content, re.DOTALL)
+                    transcript_match = _TRANSCRIPT_LOOSE_RE.search(response_content)
                 
                 if transcript_match:
                     extracted_transcript = transcript_match.group(1)
@@ -290,7 +297,7 @@ Return ONLY valid JSON (no markdown, no code blocks, no extra text):
                 
                 # Parse retry response
                 try:
-                    json_match = re.search(r'\{.*\}', retry_content, re.DOTALL)
+                    json_match = _JSON_RE.search(retry_content)
                     if json_match:
                         retry_result = json.loads(json_match.group())
                         if retry_result.get("transcript") and len(retry_result.get("transcript", "").strip()) > 50:
@@ -443,7 +450,7 @@ def video_transcript_agent(state: CourseState) -> CourseState:
         state["current_step"] = "video_transcripts_created"
         
         # Save results
-        saver = ResultsSaver()
+        saver = get_saver()
         saver.save_video_transcripts(all_transcripts, thread_id)
         
         total_duration = sum(t.get("video_duration_minutes", 0) for t in all_transcripts)
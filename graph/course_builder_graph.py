@@ -1,14 +1,15 @@
 """LangGraph workflow definition for course builder."""
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableLambda
 from typing import Literal
 from state.base_state import CourseState
 
 # Import nodes
 from nodes.question_collector import collect_user_input
-from agents.researcher_agent import researcher_agent
+from agents.researcher_agent import researcher_agent, researcher_agent_async
 from agents.module_structure_agent import module_structure_agent
-from agents.xdp_agent import xdp_agent
+from agents.xdp_agent import xdp_agent, xdp_agent_async
 from agents.course_content_agent import course_content_agent
 from agents.quiz_curator_agent import quiz_curator_agent
 from agents.video_transcript_agent import video_transcript_agent
@@ -126,12 +127,17 @@ def create_course_builder_graph():
     
     # Add nodes
     workflow.add_node("collect_user_input", collect_user_input)
-    workflow.add_node("researcher_agent", researcher_agent)
+    # Register sync + async implementations together: sync drivers keep the
+    # current behavior, while async drivers (ainvoke/astream) get non-blocking
+    # Gemini I/O so independent branches can run concurrently.
+    workflow.add_node("researcher_agent",
+                     RunnableLambda(researcher_agent, afunc=researcher_agent_async))
     workflow.add_node("module_structure_agent", module_structure_agent)
     workflow.add_node("validate_module_structure", 
                      lambda state: update_validation_results(state, "module_structure", validate_module_structure))
     workflow.add_node("human_review_structure", human_review_structure)
-    workflow.add_node("xdp_agent", xdp_agent)
+    workflow.add_node("xdp_agent",
+                     RunnableLambda(xdp_agent, afunc=xdp_agent_async))
     workflow.add_node("course_content_agent", course_content_agent)
     workflow.add_node("validate_content",
                      lambda state: update_validation_results(state, "content", validate_content))
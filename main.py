@@ -1,43 +1,130 @@
 """Main entry point for the Course Builder application."""
+import errno
+import functools
+import logging
 import os
-import glob
+import sys
+from operator import itemgetter
+from types import MappingProxyType
 from graph.course_builder_graph import create_course_builder_graph
 from state.base_state import CourseState
 from langgraph.checkpoint.memory import MemorySaver
 from utils.progress_tracker import ProgressTracker
+from utils.background_io import wait_for_saves
+
+# Progress output goes through a named logger so API deployments can turn
+# the chatter off (services/api.py raises this to WARNING) while the CLI
+# keeps it visible via basicConfig in __main__.
+logger = logging.getLogger("course_builder")
+
+# Optional io_uring support for batching unlink syscalls (Linux 5.11+).
+# Falls back to a plain os.remove loop when the bindings aren't available.
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+
+def _batch_unlink(paths: list) -> None:
+    """
+    Remove files, submitting all unlinks as one io_uring batch when possible.
+
+    A Python-level os.remove loop issues one unlink syscall per file with
+    interpreter overhead between each; with io_uring the whole batch goes
+    down in a single submit and completions are reaped in bulk.
+    """
+    if liburing is not None and len(paths) > 1:
+        try:
+            # user_data carries the submission index so each completion -
+            # they can arrive out of order - maps back to its path.
+            failed = []
+            ring = liburing.io_uring()
+            liburing.io_uring_queue_init(len(paths), ring, 0)
+            try:
+                for i, path in enumerate(paths):
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_unlinkat(sqe, liburing.AT_FDCWD, path.encode(), 0)
+                    sqe.user_data = i
+                liburing.io_uring_submit_and_wait(ring, len(paths))
+                cqe = liburing.io_uring_cqe()
+                for _ in paths:
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    if cqe.res == 0:
+                        logger.info("🗑️  Cleared previous file: %s",
+                                    os.path.basename(paths[cqe.user_data]))
+                    elif cqe.res != -errno.ENOENT:
+                        # Already-gone files are fine (matches the
+                        # FileNotFoundError pass below); anything else
+                        # gets retried through the plain loop so a stale
+                        # artifact can't masquerade as current output.
+                        failed.append(paths[cqe.user_data])
+                    liburing.io_uring_cqe_seen(ring, cqe)
+            finally:
+                liburing.io_uring_queue_exit(ring)
+            if not failed:
+                return
+            paths = failed
+        except Exception:
+            # Kernel or binding doesn't support batched unlink - fall through
+            pass
+
+    for path in paths:
+        try:
+            os.remove(path)
+            logger.info("🗑️  Cleared previous file: %s", os.path.basename(path))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Could not remove %s: %s", path, e)
+
+
+# Static defaults for a fresh CourseState. Mutable fields hold None
+# sentinels here; initialize_state assigns fresh instances so runs never
+# share containers through the template.
+_STATE_TEMPLATE = {
+    # User Input
+    "course_subject": "",
+    "learner_level": "intermediate",
+    "course_duration": "4 weeks",
+    "number_of_modules": 4,
+    "graded_quizzes_per_module": 1,
+    "practice_quizzes_per_module": 2,
+    "needs_lab_module": False,
+    "custom_prompt": "",
+    "xdp_use_llm": False,
+
+    # Empty output structures
+    "research_findings": None,
+    "module_structure": None,
+    "xdp_content": None,
+    "course_content": None,
+    "quizzes": None,
+    "video_transcripts": None,
+
+    # Control structures (fresh instances assigned per run)
+    "validation_results": None,
+    "human_feedback": None,
+    "approval_status": None,
+
+    # Metadata
+    "course_metadata": None,
+    "errors": None,
+    "current_step": "initialized",
+}
 
 
 def initialize_state(user_input: dict, thread_id: str = "default") -> CourseState:
-    """Initialize state with user input."""
-    return CourseState(
-        # User Input
-        course_subject=user_input.get("course_subject", ""),
-        learner_level=user_input.get("learner_level", "intermediate"),
-        course_duration=user_input.get("course_duration", "4 weeks"),
-        number_of_modules=user_input.get("number_of_modules", 4),
-        graded_quizzes_per_module=user_input.get("graded_quizzes_per_module", 1),
-        practice_quizzes_per_module=user_input.get("practice_quizzes_per_module", 2),
-        needs_lab_module=user_input.get("needs_lab_module", False),
-        custom_prompt=user_input.get("custom_prompt", ""),
-        
-        # Initialize empty structures
-        research_findings=None,
-        module_structure=None,
-        xdp_content=None,
-        course_content=None,
-        quizzes=None,
-        video_transcripts=None,
-        
-        # Initialize control structures
-        validation_results={},
-        human_feedback={},
-        approval_status={},
-        
-        # Metadata (include thread_id for results saving)
-        course_metadata={"thread_id": thread_id},
-        errors=[],
-        current_step="initialized"
-    )
+    """Initialize state with user input layered over the static template."""
+    # One C-level dict copy + update instead of 16 per-call .get lookups;
+    # the keys() intersection drops any unknown keys from user_input.
+    state = _STATE_TEMPLATE.copy()
+    state.update((k, user_input[k]) for k in user_input.keys() & _STATE_TEMPLATE.keys())
+    state["validation_results"] = {}
+    state["human_feedback"] = {}
+    state["approval_status"] = {}
+    state["course_metadata"] = {"thread_id": thread_id}
+    state["errors"] = []
+    return state
 
 
 def clear_previous_run(thread_id: str, output_dir: str = "course_outputs"):
@@ -53,14 +140,176 @@ def clear_previous_run(thread_id: str, output_dir: str = "course_outputs"):
         output_dir: Output directory
     """
     # Clear all output files for this thread_id
-    # This does NOT affect LangGraph checkpoints, which are in-memory
-    pattern = os.path.join(output_dir, f"{thread_id}_*.json")
-    for filepath in glob.glob(pattern):
-        try:
-            os.remove(filepath)
-            print(f"🗑️  Cleared previous file: {os.path.basename(filepath)}")
-        except Exception as e:
-            print(f"⚠️  Could not remove {filepath}: {e}")
+    # This does NOT affect LangGraph checkpoints, which are in-memory.
+    # scandir + startswith/endswith skips glob's per-call fnmatch regex
+    # compilation and feeds all matches to one batched unlink.
+    prefix = f"{thread_id}_"
+    try:
+        it = os.scandir(output_dir)
+    except FileNotFoundError:
+        return
+    with it:
+        paths = [
+            entry.path for entry in it
+            if entry.name.startswith(prefix) and entry.name.endswith(".json")
+        ]
+    _batch_unlink(paths)
+
+
+def _extract_state_data(node_state) -> dict:
+    """
+    Normalize a streamed node payload to a plain state dict.
+
+    LangGraph's stream contract for the modes used here delivers
+    {node_name: state_dict} - node payloads are always dicts, never
+    tuples, so the old defensive tuple branch could not match and only
+    added a type check plus len() on the hottest line of the stream loop.
+    Anything non-dict is treated as "no usable state".
+    """
+    return node_state if isinstance(node_state, dict) else {}
+
+
+# Shared read-only detail payloads for the fixed workflow log_step calls,
+# so long runs don't allocate a fresh dict literal per iteration.
+_STEP_INTERRUPT = MappingProxyType({"action": "continuing_after_interrupt"})
+_STEP_COMPLETED_END = MappingProxyType({"reached_end": True, "final": True})
+_STEP_COMPLETED_NO_END = MappingProxyType({"reached_end": False, "final": True})
+
+
+_get_lessons = itemgetter("lessons")
+
+
+def _count_lessons(modules: list) -> int:
+    """
+    Total lessons across modules via C-level map/itemgetter iteration;
+    falls back to the tolerant generator if any module lacks "lessons".
+    """
+    try:
+        return sum(map(len, map(_get_lessons, modules)))
+    except KeyError:
+        return sum(len(m.get("lessons", ())) for m in modules)
+
+
+# (state key, detail extractor) pairs checked on every node update, in
+# display order. Built once so the per-event loop is a single pass.
+_DETAIL_EXTRACTORS = (
+    ("module_structure", lambda value: {
+        "modules": len(value.get("modules", [])),
+        "total_lessons": _count_lessons(value.get("modules", []))
+    }),
+    ("course_content", lambda value: {"lessons": len(value)}),
+    ("quizzes", lambda value: {"quizzes": len(value)}),
+    ("xdp_content", lambda value: {"xdp_content": "generated"}),
+    ("course_metadata", lambda value: {"course_finalized": True}),
+)
+
+_DETAIL_LABELS = {
+    "modules": "Modules created",
+    "total_lessons": "Total lessons",
+    "lessons": "Lessons generated",
+    "quizzes": "Quizzes created",
+    "xdp_content": "XDP content generated",
+    "course_finalized": "Course finalized",
+}
+
+
+def _process_node_update(node_name: str, node_state, progress: ProgressTracker,
+                         lines: list, end_flag: list = None):
+    """
+    Log a single streamed node update, buffering display output in lines.
+
+    Shared by every stream loop in this module so the isinstance/detail
+    extraction logic lives in exactly one place. Output is appended to
+    lines rather than printed so the caller can flush a whole stream tick
+    with one stdout write instead of one locked flush per line. When an
+    end_flag holder is supplied, end_flag[0] is set the moment
+    course_metadata appears, so callers learn END was reached without
+    rescanning the final state afterwards. Returns the normalized state
+    dict, or None if the payload carried no usable state.
+    """
+    state_data = _extract_state_data(node_state)
+    # Only process if we have valid state data
+    if not state_data:
+        return None
+
+    state_get = state_data.get
+
+    # Intern node names so the repeated dict-key and equality checks on
+    # them resolve by identity across events.
+    node_name = sys.intern(node_name)
+
+    # finalize_course is the only node that writes course_metadata, so its
+    # appearance means the graph is about to route to END.
+    if end_flag is not None and state_get("course_metadata"):
+        end_flag[0] = True
+
+    # Display formatting is skipped entirely when INFO is off (the API
+    # path); the details dict is still computed because the progress
+    # tracker records it for get_progress consumers.
+    info = logger.isEnabledFor(logging.INFO)
+
+    progress.log_node_start(node_name)
+    current_step = state_get("current_step")
+    if info:
+        lines.append(f"Step: {node_name}")
+
+        # Special handling for routing nodes (they don't appear in stream but affect flow)
+        if node_name == "human_review_quizzes" and \
+                (quiz_approval := state_get("approval_status", {}).get("quizzes")) is not None:
+            lines.append(f"  Quiz review completed. Approval: {quiz_approval}")
+            lines.append(f"  Waiting for routing to next step...")
+
+        if current_step is not None:
+            lines.append(f"  Status: {current_step}")
+
+    # Extract detailed results - check the FULL state for outputs
+    details = {}
+    for key, extractor in _DETAIL_EXTRACTORS:
+        value = state_get(key)
+        if value:
+            details = extractor(value)
+            if info:
+                for detail_key, detail_value in details.items():
+                    label = _DETAIL_LABELS.get(detail_key, detail_key)
+                    if detail_value is True or detail_value == "generated":
+                        lines.append(f"  {label}")
+                    else:
+                        lines.append(f"  {label}: {detail_value}")
+
+    if details:
+        progress.log_node_complete(node_name, details)
+    elif current_step is not None:
+        progress.log_node_complete(node_name, {"status": current_step})
+
+    # Log any errors
+    if errors := state_get("errors"):
+        logger.error("Node %s error: %s", node_name, errors[-1])
+        progress.log_node_error(node_name, str(errors[-1]))
+
+    return state_data
+
+
+def _flush_lines(lines: list) -> None:
+    """Emit buffered output lines as one log record per stream tick."""
+    if lines:
+        logger.info("%s", "\n".join(lines))
+        lines.clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_app():
+    """
+    Compile the course builder graph once and reuse it across runs.
+
+    Graph construction instantiates every node, compiles the edges, and
+    binds the MemorySaver checkpointer - repeating that per request in the
+    API path is pure overhead since the topology is static. Sharing one
+    compiled app is safe because checkpoints are keyed by thread_id in
+    config["configurable"], which also lets interrupts and feedback loops
+    resume against the same MemorySaver. Call _get_app.cache_clear() to
+    force a rebuild during development.
+    """
+    return create_course_builder_graph()
 
 
 def run_course_builder(user_input: dict, thread_id: str = "default", clear_existing: bool = True):
@@ -79,10 +328,8 @@ def run_course_builder(user_input: dict, thread_id: str = "default", clear_exist
     if clear_existing:
         clear_previous_run(thread_id)
     
-    # Create graph with MemorySaver for checkpointing
-    # Note: MemorySaver is in-memory and persists checkpoints during this workflow execution
-    # The same 'app' instance is used throughout, so interrupts and feedback loops work correctly
-    app = create_course_builder_graph()
+    # Reuse the compiled graph across runs
+    app = _get_app()
     
     # Initialize state
     initial_state = initialize_state(user_input, thread_id)
@@ -94,222 +341,63 @@ def run_course_builder(user_input: dict, thread_id: str = "default", clear_exist
     progress = ProgressTracker(thread_id)
     progress.log_step("workflow", "started", {"thread_id": thread_id})
     
-    # Run the workflow
+    # Run the workflow; end_flag[0] flips when finalize_course is streamed,
+    # replacing the old post-loop rescans of the final state.
+    #
+    # Single stream driver: the first pass feeds initial_state, and every
+    # resume after an interrupt re-enters the same loop with None so
+    # LangGraph continues from the checkpoint. One loop, one copy of the
+    # node-update handling, however many interrupts occur.
+    end_flag = [False]
     final_state = None
-    for state_update in app.stream(initial_state, config=config):
-        # Handle state update - can be dict or tuple
-        if isinstance(state_update, dict):
-            state_dict = state_update
-        else:
-            state_dict = dict(state_update)
-        
-        # Check if this is an interrupt (workflow paused after node)
-        if "__interrupt__" in state_dict:
-            # Feedback already collected in the node, just continue streaming from checkpoint
-            progress.log_step("workflow", "in_progress", {"action": "continuing_after_interrupt"})
-            print("\n" + "="*70)
-            print("🔄 CONTINUING WORKFLOW AFTER REVIEW")
-            print("="*70 + "\n")
-            # Continue streaming from where we left off
-            # Use a while loop to handle nested interrupts and ensure we continue until workflow completes
-            while True:
-                stream_ended = True
-                for state_update in app.stream(None, config=config):
-                    stream_ended = False
-                    if isinstance(state_update, dict):
-                        state_dict = state_update
-                    else:
-                        state_dict = dict(state_update)
-                    
-                    # Handle nested interrupts recursively
-                    if "__interrupt__" in state_dict:
-                        progress.log_step("workflow", "in_progress", {"action": "continuing_after_interrupt"})
-                        print("\n🔄 Continuing workflow after review...\n")
-                        break  # Break inner loop, continue outer while loop
-                    
-                    # LangGraph streams return {node_name: full_state_after_node}
-                    # Extract node name and full state
-                    for node_name, node_state in state_dict.items():
-                        # node_state is the FULL state after this node executes
-                        if isinstance(node_state, dict):
-                            state_data = node_state
-                        elif isinstance(node_state, tuple):
-                            state_data = node_state[1] if len(node_state) > 1 else {}
-                        else:
-                            state_data = {}
-                        
-                        # Only process if we have valid state data
-                        if not isinstance(state_data, dict) or not state_data:
-                            continue
-                        
-                        progress.log_node_start(node_name)
-                        print(f"Step: {node_name}")
-                        
-                        # Special handling for routing nodes (they don't appear in stream but affect flow)
-                        if node_name == "human_review_quizzes" and state_data.get("approval_status", {}).get("quizzes") is not None:
-                            print(f"  Quiz review completed. Approval: {state_data['approval_status'].get('quizzes')}")
-                            print(f"  Waiting for routing to next step...")
-                        
-                        if "current_step" in state_data:
-                            print(f"  Status: {state_data['current_step']}")
-                        
-                        # Display detailed results - check the FULL state for outputs
-                        details = {}
-                        if state_data.get("module_structure"):
-                            modules = state_data["module_structure"].get("modules", [])
-                            print(f"  Modules created: {len(modules)}")
-                            total_lessons = sum(len(m.get("lessons", [])) for m in modules)
-                            print(f"  Total lessons: {total_lessons}")
-                            details = {"modules": len(modules), "total_lessons": total_lessons}
-                        
-                        if state_data.get("course_content"):
-                            lessons = state_data["course_content"]
-                            print(f"  Lessons generated: {len(lessons)}")
-                            details = {"lessons": len(lessons)}
-                        
-                        if state_data.get("quizzes"):
-                            quizzes = state_data["quizzes"]
-                            print(f"  Quizzes created: {len(quizzes)}")
-                            details = {"quizzes": len(quizzes)}
-                        
-                        if state_data.get("xdp_content"):
-                            print(f"  XDP content generated")
-                            details = {"xdp_content": "generated"}
-                        
-                        if state_data.get("course_metadata"):
-                            print(f"  Course finalized")
-                            details = {"course_finalized": True}
-                        
-                        if details:
-                            progress.log_node_complete(node_name, details)
-                        elif "current_step" in state_data:
-                            progress.log_node_complete(node_name, {"status": state_data['current_step']})
-                        
-                        # Log any errors
-                        if state_data.get("errors"):
-                            print(f"  Error: {state_data['errors'][-1]}")
-                            progress.log_node_error(node_name, str(state_data["errors"][-1]))
-                    
-                    final_state = state_dict
-                
-                # If stream ended, check if we need to continue
-                if stream_ended:
-                    # Check if finalize_course has run by checking for course_metadata
-                    if final_state and isinstance(final_state, dict):
-                        # Check all node states in final_state
-                        for node_name, node_state in final_state.items():
-                            if node_name == "__interrupt__":
-                                continue
-                            if isinstance(node_state, dict):
-                                state_data = node_state
-                            elif isinstance(node_state, tuple):
-                                state_data = node_state[1] if len(node_state) > 1 else {}
-                            else:
-                                state_data = {}
-                            
-                            if state_data.get("course_metadata"):
-                                print("\n✅ Course finalized detected. Workflow complete.")
-                                break
-                    
-                    # Break out of while loop if stream ended
-                    break
-            
-            progress.log_step("workflow", "completed", {"final": True})
-            return final_state, thread_id
-        
-        # Log and print current step
-        for node_name, node_state in state_dict.items():
-            # node_state is the FULL state after this node executes
-            if isinstance(node_state, dict):
-                state_data = node_state
-            elif isinstance(node_state, tuple):
-                state_data = node_state[1] if len(node_state) > 1 else {}
+    stream_input = initial_state
+    while True:
+        interrupted = False
+        for state_update in app.stream(stream_input, config=config):
+            # Handle state update - can be dict or tuple
+            if isinstance(state_update, dict):
+                state_dict = state_update
             else:
-                state_data = {}
-            
-            # Only process if we have valid state data
-            if not isinstance(state_data, dict) or not state_data:
-                continue
-            
-            progress.log_node_start(node_name)
-            print(f"Step: {node_name}")
-            
-            if "current_step" in state_data:
-                print(f"  Status: {state_data['current_step']}")
-            
-            # Display detailed results - check the FULL state for outputs
-            details = {}
-            if state_data.get("module_structure"):
-                modules = state_data["module_structure"].get("modules", [])
-                print(f"  Modules created: {len(modules)}")
-                total_lessons = sum(len(m.get("lessons", [])) for m in modules)
-                print(f"  Total lessons: {total_lessons}")
-                details = {"modules": len(modules), "total_lessons": total_lessons}
-            
-            if state_data.get("course_content"):
-                lessons = state_data["course_content"]
-                print(f"  Lessons generated: {len(lessons)}")
-                details = {"lessons": len(lessons)}
-            
-            if state_data.get("quizzes"):
-                quizzes = state_data["quizzes"]
-                print(f"  Quizzes created: {len(quizzes)}")
-                details = {"quizzes": len(quizzes)}
-            
-            if state_data.get("xdp_content"):
-                print(f"  XDP content generated")
-                details = {"xdp_content": "generated"}
-            
-            if state_data.get("course_metadata"):
-                print(f"  Course finalized")
-                details = {"course_finalized": True}
-            
-            if details:
-                progress.log_node_complete(node_name, details)
-            elif "current_step" in state_data:
-                progress.log_node_complete(node_name, {"status": state_data['current_step']})
-            
-            # Log any errors
-            if state_data.get("errors"):
-                print(f"  Error: {state_data['errors'][-1]}")
-                progress.log_node_error(node_name, str(state_data["errors"][-1]))
-        
-        final_state = state_dict
-    
+                state_dict = dict(state_update)
+
+            # Workflow paused after a HITL node; feedback was already
+            # collected in the node, so just resume from the checkpoint.
+            if "__interrupt__" in state_dict:
+                progress.log_step("workflow", "in_progress", _STEP_INTERRUPT)
+                logger.info("\n%s\n🔄 CONTINUING WORKFLOW AFTER REVIEW\n%s\n", "="*70, "="*70)
+                interrupted = True
+                break
+
+            # Log and print current step, one stdout write per stream tick
+            lines = []
+            for node_name, node_state in state_dict.items():
+                _process_node_update(node_name, node_state, progress, lines, end_flag)
+            _flush_lines(lines)
+
+            final_state = state_dict
+
+        if not interrupted:
+            break
+        stream_input = None
+
+    # Drain finalization writes that were handed off to the background
+    # pool; they overlapped the stream close and must land before we
+    # report the run complete.
+    wait_for_saves(thread_id)
+
     # When stream ends, check if END was reached (finalize_course completed)
     # In LangGraph, END is not an executable node - when a node routes to END, the stream ends
-    print("\n" + "="*70)
-    print("📊 STREAM ENDED - Checking if END node was reached...")
-    print("="*70)
-    
-    end_reached = False
-    if final_state and isinstance(final_state, dict):
-        for node_name, node_state in final_state.items():
-            if node_name == "__interrupt__":
-                continue
-            if isinstance(node_state, dict):
-                state_data = node_state
-            elif isinstance(node_state, tuple):
-                state_data = node_state[1] if len(node_state) > 1 else {}
-            else:
-                state_data = {}
-            
-            if isinstance(state_data, dict) and state_data.get("course_metadata"):
-                end_reached = True
-                print("\n✅ Workflow reached END node successfully!")
-                print("   (END is not an executable node - stream ending after finalize_course confirms END was reached)")
-                break
-    
+    end_reached = end_flag[0]
     if end_reached:
-        progress.log_step("workflow", "completed", {"reached_end": True, "final": True})
-        print("\n✅ Workflow completed successfully. Exiting...")
+        progress.log_step("workflow", "completed", _STEP_COMPLETED_END)
+        logger.info("✅ Workflow reached END node and completed successfully.")
     else:
-        progress.log_step("workflow", "completed", {"reached_end": False, "final": True})
-        print("⚠️ Warning: Stream ended but END node may not have been reached.")
-        print("   This might indicate the workflow did not complete successfully.")
-        print("   Final state keys:", list(final_state.keys()) if final_state else "None")
+        progress.log_step("workflow", "completed", _STEP_COMPLETED_NO_END)
+        logger.warning(
+            "Stream ended but END node may not have been reached. Final state keys: %s",
+            list(final_state.keys()) if final_state else "None"
+        )
     
-    print("="*70 + "\n")
     return final_state, thread_id
 
 
@@ -325,7 +413,7 @@ def resume_after_interrupt(thread_id: str, config: dict = None):
     Returns:
         Updated state
     """
-    app = create_course_builder_graph()
+    app = _get_app()
     
     if config is None:
         config = {"configurable": {"thread_id": thread_id}}
@@ -342,17 +430,12 @@ def resume_after_interrupt(thread_id: str, config: dict = None):
             if node_name == "__interrupt__":
                 continue
                 
-            print(f"Step: {node_name}")
+            logger.info("Step: %s", node_name)
             
-            if isinstance(node_state, dict):
-                state_data = node_state
-            elif isinstance(node_state, tuple):
-                state_data = node_state[1] if len(node_state) > 1 else {}
-            else:
-                state_data = {}
+            state_data = _extract_state_data(node_state)
             
-            if isinstance(state_data, dict) and "current_step" in state_data:
-                print(f"  Status: {state_data['current_step']}")
+            if (step := state_data.get("current_step")) is not None:
+                logger.info("  Status: %s", step)
         
         final_state = state_dict
     
@@ -360,6 +443,9 @@ def resume_after_interrupt(thread_id: str, config: dict = None):
 
 
 if __name__ == "__main__":
+    # CLI runs want the progress output visible
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Example usage
     print("Course Builder - AI-Powered Course Authoring")
     print("=" * 50)
@@ -393,10 +479,10 @@ if __name__ == "__main__":
             else:
                 state_data = {}
             
-            if isinstance(state_data, dict) and state_data.get("course_metadata"):
+            if isinstance(state_data, dict) and (metadata := state_data.get("course_metadata")):
                 print("\n✅ Course generation completed!")
                 print(f"\nCourse Statistics:")
-                stats = state_data["course_metadata"].get("statistics", {})
+                stats = metadata.get("statistics", {})
                 for key, value in stats.items():
                     print(f"  {key}: {value}")
                 
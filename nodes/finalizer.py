@@ -1,7 +1,8 @@
 """Course Finalizer - Compiles complete course and generates final output."""
 from typing import Dict, Any
 from state.base_state import CourseState
-from utils.results_saver import ResultsSaver
+from utils.background_io import schedule_save, wait_for_saves
+from utils.results_saver import get_saver
 from utils.progress_tracker import ProgressTracker
 import json
 from datetime import datetime
@@ -15,6 +16,9 @@ def finalize_course(state: CourseState) -> CourseState:
         thread_id = state.get("course_metadata", {}).get("thread_id", "default")
         progress = ProgressTracker(thread_id)
         progress.log_node_progress("finalize_course", {"message": "Compiling final course structure"})
+
+        # Drain any step results still being written in the background
+        wait_for_saves(thread_id)
         
         # Compile complete course structure
         complete_course = {
@@ -120,9 +124,10 @@ designed for {state['learner_level']} learners. The course is structured into
         state["course_metadata"] = course_metadata
         state["current_step"] = "course_finalized"
         
-        # Save final course
-        saver = ResultsSaver()
-        saver.save_final_course(course_metadata, thread_id)
+        # Save final course in the background; the write overlaps the
+        # stream close and run_course_builder drains it before returning.
+        saver = get_saver()
+        schedule_save(thread_id, saver.save_final_course, course_metadata, thread_id)
         
         stats = course_metadata.get("statistics", {})
         progress.log_node_complete("finalize_course", {
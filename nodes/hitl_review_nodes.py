@@ -2,7 +2,7 @@
 from typing import Dict, Any, Literal
 from state.base_state import CourseState
 from nodes.interrupt_handler import show_interrupt_info, get_interactive_feedback
-from utils.results_saver import ResultsSaver
+from utils.results_saver import get_saver
 
 
 def _ensure_feedback_state(state: CourseState, review_type: str) -> CourseState:
@@ -87,7 +87,7 @@ def human_review_structure(state: CourseState) -> CourseState:
     thread_id = state.get("course_metadata", {}).get("thread_id", "default")
     
     # Save results before interrupt
-    saver = ResultsSaver()
+    saver = get_saver()
     if state.get("module_structure"):
         saver.save_module_structure(state["module_structure"], thread_id)
     
@@ -121,7 +121,7 @@ def human_review_content(state: CourseState) -> CourseState:
     thread_id = state.get("course_metadata", {}).get("thread_id", "default")
     
     # Save results before interrupt
-    saver = ResultsSaver()
+    saver = get_saver()
     if state.get("course_content"):
         saver.save_course_content(state["course_content"], thread_id)
     
@@ -158,7 +158,7 @@ def human_review_quizzes(state: CourseState) -> CourseState:
     thread_id = state.get("course_metadata", {}).get("thread_id", "default")
     
     # Save results before interrupt
-    saver = ResultsSaver()
+    saver = get_saver()
     if state.get("quizzes"):
         saver.save_quizzes(state["quizzes"], thread_id)
     
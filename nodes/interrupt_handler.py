@@ -2,7 +2,7 @@
 import json
 import os
 from typing import Dict, Any, Optional
-from utils.results_saver import ResultsSaver
+from utils.results_saver import get_saver
 
 
 def get_interactive_feedback(interrupt_type: str, state: Dict[str, Any]) -> Dict[str, Any]:
@@ -193,7 +193,7 @@ def show_interrupt_info(interrupt_type: str, state: Dict[str, Any], thread_id: s
     Display information about what needs human review at interrupt point.
     Now uses interactive CLI instead of file-based feedback.
     """
-    saver = ResultsSaver()
+    saver = get_saver()
     
     # Save results for reference
     if interrupt_type == "structure" and state.get("module_structure"):
@@ -2,6 +2,21 @@
 from typing import Dict, Any
 from state.base_state import CourseState
 
+# Required user-input fields, hoisted so each call does one C-level set
+# difference instead of rebuilding the list and double-probing the state.
+# Note: custom_prompt is optional, so not in _REQUIRED.
+_REQUIRED = frozenset({
+    "course_subject",
+    "learner_level",
+    "course_duration",
+    "number_of_modules",
+    "graded_quizzes_per_module",
+    "practice_quizzes_per_module",
+    "needs_lab_module",
+})
+
+_VALID_LEVELS = frozenset({"basic", "intermediate", "advanced"})
+
 
 def collect_user_input(state: CourseState) -> CourseState:
     """
@@ -12,19 +27,9 @@ def collect_user_input(state: CourseState) -> CourseState:
     or raise an interrupt to get user input.
     """
     # Check if all required fields are present
-    required_fields = [
-        "course_subject",
-        "learner_level", 
-        "course_duration",
-        "number_of_modules",
-        "graded_quizzes_per_module",
-        "practice_quizzes_per_module",
-        "needs_lab_module"
-        # Note: custom_prompt is optional, so not in required_fields
-    ]
-    
-    missing_fields = [field for field in required_fields if field not in state or state.get(field) is None]
-    
+    present = {k for k, v in state.items() if v is not None}
+    missing_fields = sorted(_REQUIRED - present)
+
     if missing_fields:
         # In real implementation, this would trigger UI to collect input
         # For now, we'll set a flag that indicates we need user input
@@ -34,7 +39,7 @@ def collect_user_input(state: CourseState) -> CourseState:
         return state
     
     # Validate inputs
-    if state["learner_level"] not in ["basic", "intermediate", "advanced"]:
+    if state["learner_level"] not in _VALID_LEVELS:
         state["errors"].append(f"Invalid learner level: {state['learner_level']}")
         return state
     
@@ -2,9 +2,24 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+# Serialize responses with orjson when it's available; the POST
+# endpoints still return full models, and orjson encodes them straight
+# to bytes several times faster than the default json encoder.
+try:
+    import orjson  # noqa: F401 - ORJSONResponse requires it at runtime
+    from fastapi.responses import ORJSONResponse as _ResponseClass
+except ImportError:
+    from fastapi.responses import JSONResponse as _ResponseClass
+
 from .config import settings
 from .conversation_manager import conversation_manager
 from .conversation_models import (
@@ -17,31 +32,80 @@ from .conversation_models import (
 )
 
 
+# The workflow's per-node progress output has no consumer in API mode -
+# clients poll the progress endpoint instead - so keep it quiet unless
+# debugging is requested.
+if not settings.debug:
+    logging.getLogger("course_builder").setLevel(logging.WARNING)
+
+
 app = FastAPI(
     title="AI Course Builder Assistant",
     version="0.1.0",
     description="Conversation-first API that wraps the LangGraph course builder workflow.",
+    default_response_class=_ResponseClass,
 )
 
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# Install the CORS middleware only when cross-origin access is configured;
+# same-origin deployments skip the per-request Origin handling entirely.
+# A precompiled origin regex is preferred over a wildcard allowlist so
+# Starlette can match without scanning an origin list per request.
+if settings.cors_origins or settings.cors_origin_regex:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_origin_regex=settings.cors_origin_regex,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
+# Pool for handlers that touch the workflow machinery. Sessions live in this
+# process's memory (ConversationManager), so threads rather than processes;
+# the point is to keep the event loop free for the cheap polling endpoints.
+_workflow_pool = ThreadPoolExecutor(
+    max_workers=settings.workflow_workers,
+    thread_name_prefix="api-workflow",
 )
 
 
+@app.on_event("shutdown")
+def _shutdown_workflow_pool() -> None:
+    _workflow_pool.shutdown(wait=True)
+
+
+def _etag_response(request: Request, body: bytes) -> Response:
+    """
+    Serve a JSON body with an ETag, or 304 when the client already has it.
+
+    The polling endpoints return identical payloads for most ticks; a
+    matching If-None-Match turns those into an 8-byte hash comparison
+    and an empty response instead of re-shipping the full JSON.
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
 @app.get("/health")
-def health() -> dict[str, str]:
+async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
 @app.post(f"{settings.api_prefix}/sessions", response_model=CreateSessionResponse)
-def create_session(payload: CreateSessionRequest | None = None) -> CreateSessionResponse:
-    state = conversation_manager.create_session(title=payload.title if payload else None)
-    return CreateSessionResponse(
+async def create_session(payload: CreateSessionRequest | None = None) -> CreateSessionResponse:
+    loop = asyncio.get_running_loop()
+    state = await loop.run_in_executor(
+        _workflow_pool,
+        conversation_manager.create_session,
+        payload.title if payload else None,
+    )
+    # Fields come straight off an internally-built SessionState, so skip
+    # re-validation on the response model
+    return CreateSessionResponse.model_construct(
         session_id=state.session_id,
         thread_id=state.thread_id,
         status=state.status,
@@ -49,18 +113,25 @@ def create_session(payload: CreateSessionRequest | None = None) -> CreateSession
 
 
 @app.get(f"{settings.api_prefix}/sessions/{{session_id}}", response_model=SessionState)
-def get_session(session_id: str) -> SessionState:
+async def get_session(session_id: str, request: Request) -> Response:
+    # Pure in-memory read - no executor hop needed
     try:
         session = conversation_manager.get_session(session_id)
-        return session.to_state()
+        return _etag_response(request, session.to_state().model_dump_json().encode("utf-8"))
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @app.post(f"{settings.api_prefix}/sessions/{{session_id}}/messages", response_model=SessionState)
-def post_message(session_id: str, payload: PostMessageRequest) -> SessionState:
+async def post_message(session_id: str, payload: PostMessageRequest) -> SessionState:
+    loop = asyncio.get_running_loop()
     try:
-        return conversation_manager.handle_message(session_id, payload)
+        return await loop.run_in_executor(
+            _workflow_pool,
+            conversation_manager.handle_message,
+            session_id,
+            payload,
+        )
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
@@ -70,19 +141,22 @@ def post_message(session_id: str, payload: PostMessageRequest) -> SessionState:
 
 
 @app.get(f"{settings.api_prefix}/sessions/{{session_id}}/progress", response_model=ProgressResponse)
-def get_progress(session_id: str) -> ProgressResponse:
+async def get_progress(session_id: str, request: Request, full: bool = False) -> Response:
     try:
-        data = conversation_manager.get_progress(session_id)
-        return ProgressResponse(**data)
+        # get_progress maintains these fields itself; no validation pass
+        # over a potentially long steps list per poll
+        data = conversation_manager.get_progress(session_id, full=full)
+        body = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+        return _etag_response(request, body)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @app.get(f"{settings.api_prefix}/sessions/{{session_id}}/artifacts", response_model=ArtifactResponse)
-def get_artifacts(session_id: str) -> ArtifactResponse:
+async def get_artifacts(session_id: str, request: Request) -> Response:
     try:
         artifacts = conversation_manager.get_artifacts(session_id)
-        return ArtifactResponse(artifacts=artifacts)
+        body = json.dumps({"artifacts": artifacts}, separators=(",", ":"), default=str).encode("utf-8")
+        return _etag_response(request, body)
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
-
@@ -1,20 +1,43 @@
 """Configuration for the conversational API layer."""
 
-from functools import lru_cache
+import os
+from dataclasses import dataclass
 from pathlib import Path
-from pydantic_settings import BaseSettings
 
+try:
+    from dotenv import dotenv_values
+except ImportError:  # pragma: no cover - optional, .env support only
+    def dotenv_values(*args, **kwargs):
+        return {}
 
-class Settings(BaseSettings):
+_ENV_PREFIX = "COURSE_APP_"
+
+# Resolved once at import; Path(__file__).resolve() stats the filesystem,
+# so it shouldn't repeat every time settings are constructed.
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """Runtime settings loaded from environment variables."""
 
     # Core paths
-    project_root: Path = Path(__file__).resolve().parent.parent
-    output_dir: Path = project_root / "course_outputs"
-    logs_dir: Path = project_root / "logs"
+    project_root: Path = _PROJECT_ROOT
+    output_dir: Path = _PROJECT_ROOT / "course_outputs"
+    logs_dir: Path = _PROJECT_ROOT / "logs"
 
     # Conversation/worker controls
+    debug: bool = False
     workflow_workers: int = 2
+    workflow_write_concurrency: int = 4
+    # In-memory messages kept per session (including the system prompt);
+    # older turns are archived to the interaction log. 0 disables capping.
+    conversation_history_window: int = 200
+    # "jsonl" (default, human-auditable) or "msgpack" (length-prefixed
+    # binary frames; faster and smaller, needs msgpack installed)
+    interaction_log_format: str = "jsonl"
     allow_clear_previous_run: bool = True
     system_prompt: str = (
         "You are the AI Course Builder guide. Ask clarifying questions until "
@@ -23,20 +46,62 @@ class Settings(BaseSettings):
         "with the user before launching generation."
     )
 
-    # API
+    # API. CORS defaults to off: configure an explicit origin allowlist or
+    # a precompiled origin regex (COURSE_APP_CORS_ORIGIN_REGEX) rather than
+    # "*", which forces Starlette to evaluate every request's Origin header.
     api_prefix: str = "/api"
-    cors_origins: list[str] = ["*"]
+    cors_origins: tuple[str, ...] = ()
+    cors_origin_regex: str | None = None
 
-    class Config:
-        env_prefix = "COURSE_APP_"
-        env_file = ".env"
-        env_file_encoding = "utf-8"
 
+def _load() -> Settings:
+    """
+    Build Settings from .env and os.environ, once at import.
 
-@lru_cache
-def get_settings() -> Settings:
-    return Settings()
+    A frozen slots dataclass with an explicit loader replaces BaseSettings:
+    no per-attribute descriptor machinery, and env parsing happens exactly
+    once at import instead of rerunning Pydantic's schema build and
+    validator pipeline in every fresh worker.
+    """
+    env = {**dotenv_values(_PROJECT_ROOT / ".env"), **os.environ}
 
+    def get(name: str):
+        return env.get(_ENV_PREFIX + name)
 
-settings = get_settings()
+    overrides = {}
+    if (value := get("DEBUG")) is not None:
+        overrides["debug"] = value.strip().lower() in _TRUTHY
+    if (value := get("OUTPUT_DIR")) is not None:
+        overrides["output_dir"] = Path(value)
+    if (value := get("LOGS_DIR")) is not None:
+        overrides["logs_dir"] = Path(value)
+    if (value := get("WORKFLOW_WORKERS")) is not None:
+        overrides["workflow_workers"] = int(value)
+    if (value := get("WORKFLOW_WRITE_CONCURRENCY")) is not None:
+        overrides["workflow_write_concurrency"] = int(value)
+    if (value := get("CONVERSATION_HISTORY_WINDOW")) is not None:
+        overrides["conversation_history_window"] = int(value)
+    if (value := get("INTERACTION_LOG_FORMAT")) is not None:
+        overrides["interaction_log_format"] = value
+    if (value := get("ALLOW_CLEAR_PREVIOUS_RUN")) is not None:
+        overrides["allow_clear_previous_run"] = value.strip().lower() in _TRUTHY
+    if (value := get("SYSTEM_PROMPT")) is not None:
+        overrides["system_prompt"] = value
+    if (value := get("API_PREFIX")) is not None:
+        overrides["api_prefix"] = value
+    if (value := get("CORS_ORIGINS")) is not None:
+        overrides["cors_origins"] = tuple(
+            origin.strip() for origin in value.split(",") if origin.strip()
+        )
+    if (value := get("CORS_ORIGIN_REGEX")) is not None:
+        overrides["cors_origin_regex"] = value
 
+    return Settings(**overrides)
+
+
+settings = _load()
+
+
+def get_settings() -> Settings:
+    """Kept for callers that prefer the accessor form."""
+    return settings
@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import itertools
 import threading
 import uuid
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from main import run_course_builder
+from utils.json_extract import json_loads
 from utils.results_saver import ResultsSaver
 
 from .config import settings
@@ -20,7 +22,19 @@ from .conversation_models import (
     PostMessageRequest,
     SessionState,
 )
-from .instrumentation import interaction_logger
+from .instrumentation import RawJSON, interaction_logger
+
+# The system prompt never changes at runtime, so validate it into a
+# message exactly once; ConversationMessage is frozen, making the shared
+# instance safe to seed every session with.
+_SYSTEM_MESSAGE = ConversationMessage(role="system", content=settings.system_prompt)
+
+# (field, keyword) pairs for the requirements heuristic; the keyword is the
+# field name with underscores spaced out, matched against lowercased user text.
+_FIELD_KEYWORDS = tuple(
+    (field, field.replace("_", " "))
+    for field in ("course_subject", "learner_level", "course_duration", "number_of_modules")
+)
 
 
 class ConversationSession:
@@ -33,20 +47,41 @@ class ConversationSession:
         self.created_at = datetime.utcnow()
         self.updated_at = self.created_at
         self.status = "awaiting_requirements"
-        self.messages: List[ConversationMessage] = [
-            ConversationMessage(role="system", content=settings.system_prompt)
-        ]
+        self.messages: List[ConversationMessage] = [_SYSTEM_MESSAGE]
         self.workflow_future: Optional[Future] = None
         self.last_error: Optional[str] = None
         self.workflow_summary: Dict[str, Any] = {}
         self.course_config: Optional[CourseConfig] = None
+        # Requirement fields already seen in user messages, maintained
+        # incrementally by append_message so the clarifying-prompt check
+        # doesn't rescan the whole history every turn.
+        self.mentioned_fields: set[str] = set()
+        # Cached (key, SessionState) of the latest to_state snapshot
+        self._state_cache: Optional[tuple] = None
+        # Incremental progress-file tail state: parsed steps so far, the
+        # byte offset they end at, and a running completed counter, so
+        # polling only reads lines appended since the previous call.
+        self._progress_cache: List[Dict[str, Any]] = []
+        self._progress_offset = 0
+        self._progress_completed = 0
+        self._progress_sig: tuple = ()
+        # Guards this session's messages/status/workflow transitions;
+        # cross-session operations never contend on it.
+        self.lock = threading.Lock()
 
     @property
     def progress_file(self) -> Path:
         return settings.output_dir / f"{self.thread_id}_progress.jsonl"
 
     def to_state(self) -> SessionState:
-        return SessionState(
+        # Reuse the previous snapshot when nothing observable changed;
+        # otherwise build via model_construct, skipping re-validation of
+        # the message list (each message was validated on ingress), which
+        # kept per-turn cost growing with conversation length.
+        key = (len(self.messages), self.updated_at, self.status, self.last_error)
+        if self._state_cache and self._state_cache[0] == key:
+            return self._state_cache[1]
+        state = SessionState.model_construct(
             session_id=self.session_id,
             thread_id=self.thread_id,
             title=self.title,
@@ -57,15 +92,45 @@ class ConversationSession:
             workflow_summary=self.workflow_summary,
             last_error=self.last_error,
         )
+        self._state_cache = (key, state)
+        return state
+
+
+class _EventLoopPool:
+    """
+    A fixed set of daemon threads, each driving its own asyncio event loop.
+
+    Workflows are scheduled onto the loops round-robin as coroutines, so a
+    single loop thread can interleave many I/O-bound workflows instead of
+    pinning one OS thread per running workflow for its entire duration.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._loops: List[asyncio.AbstractEventLoop] = []
+        self._counter = itertools.count()
+        for index in range(size):
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name=f"workflow-loop-{index}", daemon=True
+            )
+            thread.start()
+            self._loops.append(loop)
+
+    def submit(self, coro) -> Future:
+        loop = self._loops[next(self._counter) % len(self._loops)]
+        return asyncio.run_coroutine_threadsafe(coro, loop)
 
 
 class ConversationManager:
-    """Stores sessions, routes actions, and runs workflows in background threads."""
+    """Stores sessions, routes actions, and runs workflows on background event loops."""
 
     def __init__(self) -> None:
+        # No manager-wide mutex: CPython dict get/set on distinct keys is
+        # atomic, so lookups and single-statement inserts need no lock and
+        # sessions only synchronize on their own session.lock. This keeps
+        # concurrent chat clients from serializing behind each other.
         self.sessions: Dict[str, ConversationSession] = {}
-        self.lock = threading.Lock()
-        self.executor = ThreadPoolExecutor(max_workers=settings.workflow_workers)
+        self.loops = _EventLoopPool(settings.workflow_workers)
         settings.output_dir.mkdir(parents=True, exist_ok=True)
         settings.logs_dir.mkdir(parents=True, exist_ok=True)
         self.results = ResultsSaver(output_dir=str(settings.output_dir))
@@ -73,8 +138,7 @@ class ConversationManager:
     # --- Session helpers -------------------------------------------------
     def create_session(self, title: str | None = None) -> SessionState:
         session = ConversationSession(title)
-        with self.lock:
-            self.sessions[session.session_id] = session
+        self.sessions[session.session_id] = session
         interaction_logger.log_event(session.session_id, "session_created", {"title": session.title})
         return session.to_state()
 
@@ -87,30 +151,50 @@ class ConversationManager:
     def append_message(
         self, session: ConversationSession, role: str, content: str, metadata: Optional[Dict[str, Any]] = None
     ) -> None:
-        session.messages.append(
-            ConversationMessage(role=role, content=content, metadata=metadata or {})
-        )
-        session.updated_at = datetime.utcnow()
+        evicted: List[ConversationMessage] = []
+        window = settings.conversation_history_window
+        with session.lock:
+            session.messages.append(
+                ConversationMessage(role=role, content=content, metadata=metadata or None)
+            )
+            # Cap the in-memory history so per-turn serialization and RSS
+            # stay bounded on long conversations: keep the system message
+            # plus the most recent window-1 turns, splicing in place so
+            # existing references to the list stay valid.
+            if window and len(session.messages) > window:
+                cut = len(session.messages) - window + 1
+                evicted = session.messages[1:cut]
+                session.messages[1:cut] = []
+            session.updated_at = datetime.utcnow()
+        if evicted:
+            interaction_logger.log_event(
+                session.session_id,
+                "messages_archived",
+                {"count": len(evicted),
+                 "messages": [message.model_dump(mode="json") for message in evicted]},
+            )
+        if role == "user":
+            lowered = content.lower()
+            for field, keyword in _FIELD_KEYWORDS:
+                if field not in session.mentioned_fields and keyword in lowered:
+                    session.mentioned_fields.add(field)
 
     # --- Workflow orchestration ------------------------------------------
     def _start_workflow(self, session: ConversationSession, config: CourseConfig) -> None:
-        if session.workflow_future and not session.workflow_future.done():
-            raise RuntimeError("Workflow already running for this session")
-
-        session.status = "running_workflow"
-        session.course_config = config
-        interaction_logger.log_event(
-            session.session_id,
-            "workflow_started",
-            {"config": config.model_dump(), "thread_id": session.thread_id},
-        )
-
-        def _runner() -> None:
+        async def _runner() -> None:
             try:
-                final_state, _ = run_course_builder(
-                    user_input=config.model_dump(),
-                    thread_id=session.thread_id,
-                    clear_existing=settings.allow_clear_previous_run,
+                # run_course_builder is synchronous today, so the graph
+                # execution is offloaded to the loop's default executor
+                # while completion handling stays on the loop; an async
+                # builder can be awaited here directly when one exists.
+                loop = asyncio.get_running_loop()
+                final_state, _ = await loop.run_in_executor(
+                    None,
+                    lambda: run_course_builder(
+                        user_input=config.model_dump(),
+                        thread_id=session.thread_id,
+                        clear_existing=settings.allow_clear_previous_run,
+                    ),
                 )
                 session.workflow_summary = self._build_summary(final_state)
                 session.status = "completed"
@@ -140,7 +224,22 @@ class ConversationManager:
                     {"error": str(exc)},
                 )
 
-        session.workflow_future = self.executor.submit(_runner)
+        # Check-and-launch under the session lock so two racing
+        # generate_course requests can't both pass the running check.
+        with session.lock:
+            if session.workflow_future and not session.workflow_future.done():
+                raise RuntimeError("Workflow already running for this session")
+            session.status = "running_workflow"
+            session.course_config = config
+            session.workflow_future = self.loops.submit(_runner())
+
+        # Serialize the config once and splice the raw JSON into the log
+        # record rather than re-dumping the model's object graph.
+        interaction_logger.log_event(
+            session.session_id,
+            "workflow_started",
+            {"config": RawJSON(config.model_dump_json()), "thread_id": session.thread_id},
+        )
 
     # --- Message routing -------------------------------------------------
     def handle_message(self, session_id: str, payload: PostMessageRequest) -> SessionState:
@@ -200,71 +299,102 @@ class ConversationManager:
     def _course_field_known(self, session: ConversationSession, field: str) -> bool:
         if session.course_config and getattr(session.course_config, field, None):
             return True
-        # Quick heuristic: scan previous user messages for keyword
-        keyword = field.replace("_", " ")
-        return any(keyword in msg.content.lower() for msg in session.messages if msg.role == "user")
+        # Heuristic match, indexed incrementally as user messages arrive
+        return field in session.mentioned_fields
 
     # --- Progress/artifacts ----------------------------------------------
-    def get_progress(self, session_id: str) -> Dict[str, Any]:
+    def get_progress(self, session_id: str, full: bool = False) -> Dict[str, Any]:
+        """
+        Return progress counters and the last step; the full step list is
+        included only when full is set, since serializing a
+        linearly-growing list on every poll dwarfs the counters the UI
+        actually renders.
+        """
         session = self.get_session(session_id)
-        if not session.progress_file.exists():
+        try:
+            stat = session.progress_file.stat()
+        except FileNotFoundError:
             return {"steps": [], "total_steps": 0, "completed_steps": 0, "last_step": None}
 
-        steps: List[Dict[str, Any]] = []
-        with session.progress_file.open("r", encoding="utf-8") as fp:
-            for line in fp:
-                line = line.strip()
-                if line:
-                    steps.append(json.loads(line))
-
-        completed = [s for s in steps if s.get("status") == "completed"]
+        # A fresh run truncates/replaces the file; restart the tail then.
+        if stat.st_size < session._progress_offset:
+            session._progress_cache = []
+            session._progress_offset = 0
+            session._progress_completed = 0
+
+        # Only parse lines appended since the last poll - frequent UI
+        # polling against a long workflow otherwise re-reads the whole
+        # JSONL every time. The stat signature short-circuits unchanged
+        # files without even opening them.
+        if (stat.st_mtime_ns, stat.st_size) != session._progress_sig:
+            with session.progress_file.open("r", encoding="utf-8") as fp:
+                fp.seek(session._progress_offset)
+                for line in fp:
+                    line = line.strip()
+                    if line:
+                        step = json_loads(line)
+                        session._progress_cache.append(step)
+                        if step.get("status") == "completed":
+                            session._progress_completed += 1
+                session._progress_offset = fp.tell()
+            session._progress_sig = (stat.st_mtime_ns, stat.st_size)
+
+        steps = session._progress_cache
         return {
-            "steps": steps,
+            "steps": steps if full else [],
             "total_steps": len(steps),
-            "completed_steps": len(completed),
+            "completed_steps": session._progress_completed,
             "last_step": steps[-1] if steps else None,
         }
 
+    _ARTIFACT_KEYS = (
+        "module_structure",
+        "course_content",
+        "quizzes",
+        "xdp_content",
+        "final_course",
+    )
+
     def get_artifacts(self, session_id: str) -> Dict[str, Any]:
         session = self.get_session(session_id)
-        available: Dict[str, Any] = {}
-        for key in [
-            "module_structure",
-            "course_content",
-            "quizzes",
-            "xdp_content",
-            "final_course",
-        ]:
-            data = self.results.get_latest_result(key, thread_id=session.thread_id)
-            if data:
-                available[key] = data
-        return available
+        # One directory scan for all artifact kinds instead of a
+        # per-key exists+read round
+        return self.results.get_latest_results(
+            list(self._ARTIFACT_KEYS), thread_id=session.thread_id
+        )
 
     # --- Helpers ---------------------------------------------------------
+    _SUMMARY_KEYS = ("module_structure", "quizzes", "course_content", "course_metadata")
+
     def _build_summary(self, final_state: Dict[str, Any]) -> Dict[str, Any]:
         summary: Dict[str, Any] = {}
         if not isinstance(final_state, dict):
             return summary
-        for _, node_state in final_state.items():
-            state_data: Dict[str, Any]
-            if isinstance(node_state, dict):
-                state_data = node_state
-            elif isinstance(node_state, tuple) and node_state:
-                state_data = node_state[-1]
-            else:
-                continue
-            if not isinstance(state_data, dict):
+
+        # Collapse the node payloads into one merged view first - later
+        # nodes carry the accumulated state, so only the last value per
+        # key matters - then derive each summary figure exactly once
+        # instead of recomputing counts for every node that repeats a key.
+        merged: Dict[str, Any] = {}
+        for node_state in final_state.values():
+            if isinstance(node_state, tuple) and node_state:
+                node_state = node_state[-1]
+            if not isinstance(node_state, dict):
                 continue
-            if "module_structure" in state_data:
-                modules = state_data["module_structure"].get("modules", [])
-                summary["modules"] = len(modules)
-                summary["lessons"] = sum(len(m.get("lessons", [])) for m in modules)
-            if "quizzes" in state_data:
-                summary["quizzes"] = len(state_data["quizzes"])
-            if "course_content" in state_data:
-                summary["content_blocks"] = len(state_data["course_content"])
-            if state_data.get("course_metadata"):
-                summary["course_metadata"] = state_data["course_metadata"]
+            for key in self._SUMMARY_KEYS:
+                if (value := node_state.get(key)) is not None:
+                    merged[key] = value
+
+        if (structure := merged.get("module_structure")) is not None:
+            modules = structure.get("modules", [])
+            summary["modules"] = len(modules)
+            summary["lessons"] = sum(len(m.get("lessons", [])) for m in modules)
+        if (quizzes := merged.get("quizzes")) is not None:
+            summary["quizzes"] = len(quizzes)
+        if (content := merged.get("course_content")) is not None:
+            summary["content_blocks"] = len(content)
+        if metadata := merged.get("course_metadata"):
+            summary["course_metadata"] = metadata
         return summary
 
 
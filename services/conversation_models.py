@@ -1,10 +1,11 @@
 """Pydantic models for the conversational API."""
 
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, computed_field, validator
 
 
 class ChatRole(str, Enum):
@@ -22,6 +23,8 @@ class CourseConfig(BaseModel):
     practice_quizzes_per_module: int = Field(default=2, ge=0, le=10)
     needs_lab_module: bool = False
     custom_prompt: str = ""
+    # Opt into LLM-generated XDP content; default keeps the fast builder
+    xdp_use_llm: bool = False
 
     @validator("course_subject")
     def subject_not_empty(cls, value: str) -> str:
@@ -31,10 +34,24 @@ class CourseConfig(BaseModel):
 
 
 class ConversationMessage(BaseModel):
+    # Frozen so instances can be shared safely (the system-prompt message
+    # is built once and reused across every session); extra="forbid" keeps
+    # stray keys from silently widening per-message allocations.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     role: ChatRole
     content: str
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    # None instead of a fresh empty dict per message: most turns carry no
+    # metadata, and long sessions hold thousands of messages in memory.
+    metadata: Optional[Dict[str, Any]] = None
+    # time.time_ns is a bare clock read; the datetime object and ISO
+    # string are only materialized when a message is serialized out.
+    timestamp_ns: int = Field(default_factory=time.time_ns)
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9, tz=timezone.utc)
 
 
 class CreateSessionRequest(BaseModel):
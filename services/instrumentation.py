@@ -2,32 +2,170 @@
 
 from __future__ import annotations
 
+import atexit
 import json
-from datetime import datetime
+import queue
+import struct
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, IO, List, Tuple
 
 from .config import settings
 
+# orjson encodes straight to UTF-8 bytes several times faster than the
+# stdlib encoder; fall back transparently when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional binary log format: records are only read back by Python
+# tooling, so msgpack framing skips UTF-8 encode/decode entirely.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class RawJSON(str):
+    """
+    Marks a string as already-serialized JSON.
+
+    Callers that hold a pre-encoded value (e.g. a Pydantic
+    model_dump_json() computed once) can wrap it in RawJSON and pass it
+    as a payload value; log_event splices it into the record verbatim
+    instead of re-serializing the object graph.
+    """
+
+
+def _dumps_record(record: Dict[str, Any]) -> bytes:
+    """Serialize a log record to bytes, splicing in any RawJSON payload values."""
+    payload = record["payload"]
+    if not isinstance(payload, dict) or not any(type(v) is RawJSON for v in payload.values()):
+        if orjson is not None:
+            return orjson.dumps(record)
+        return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+    parts = []
+    for key, value in payload.items():
+        encoded = value if type(value) is RawJSON else json.dumps(value, ensure_ascii=False)
+        parts.append(f"{json.dumps(key, ensure_ascii=False)}:{encoded}")
+    return (
+        '{"session_id":' + json.dumps(record["session_id"], ensure_ascii=False)
+        + ',"event_type":' + json.dumps(record["event_type"], ensure_ascii=False)
+        + ',"payload":{' + ",".join(parts)
+        + '},"timestamp_ns":' + str(record["timestamp_ns"]) + '}'
+    ).encode("utf-8")
+
+
+# Terminal workflow events force their file to disk; everything else rides
+# on OS buffering until the next terminal event or shutdown flush.
+_FLUSH_EVENTS = frozenset({"workflow_completed", "workflow_failed"})
+
 
 class InteractionLogger:
-    """Writes structured interaction logs to disk for auditing."""
+    """
+    Writes structured interaction logs to disk for auditing.
+
+    Events are serialized on the caller's thread and handed to a daemon
+    writer through a queue, so the request path issues no syscalls at
+    all. The writer drains whatever has accumulated, groups lines by
+    logfile, and appends each group with one write against a cached file
+    handle - replacing the previous open()+write()+close() trio per
+    event with a single buffered append per burst.
+    """
 
     def __init__(self) -> None:
         self.log_dir = settings.logs_dir / "conversations"
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._msgpack = settings.interaction_log_format == "msgpack" and msgpack is not None
+        self._queue: "queue.Queue[Tuple[Path, bytes, bool]]" = queue.Queue()
+        self._files: Dict[Path, IO[bytes]] = {}
+        self._writer = threading.Thread(target=self._drain, name="interaction-log", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
 
     def log_event(self, session_id: str, event_type: str, payload: Dict[str, Any]) -> None:
         record = {
             "session_id": session_id,
             "event_type": event_type,
             "payload": payload,
-            "timestamp": datetime.utcnow().isoformat(),
+            # Integer nanoseconds: one clock read, no datetime allocation
+            # or ISO formatting on the hot path.
+            "timestamp_ns": time.time_ns(),
         }
-        logfile = self.log_dir / f"{session_id}.jsonl"
-        with logfile.open("a", encoding="utf-8") as fp:
-            fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if self._msgpack:
+            # Length-prefixed msgpack frame; payload values (including
+            # RawJSON strings) pass through as-is.
+            body = msgpack.packb(record, default=str)
+            line = struct.pack("<I", len(body)) + body
+            path = self.log_dir / f"{session_id}.msgpack"
+        else:
+            line = _dumps_record(record) + b"\n"
+            path = self.log_dir / f"{session_id}.jsonl"
+        self._queue.put_nowait((path, line, event_type in _FLUSH_EVENTS))
 
+    # --- Writer thread ----------------------------------------------------
+    def _file(self, path: Path) -> IO[bytes]:
+        """Return the cached append handle for this logfile, opening once."""
+        fp = self._files.get(path)
+        if fp is None:
+            fp = path.open("ab")
+            self._files[path] = fp
+        return fp
 
-interaction_logger = InteractionLogger()
+    def _drain(self) -> None:
+        while True:
+            # Block for the first event, then sweep everything pending so
+            # a burst of events becomes one write per file.
+            path, line, flush = self._queue.get()
+            batch: Dict[Path, List[bytes]] = {path: [line]}
+            flush_paths = {path} if flush else set()
+            try:
+                while True:
+                    path, line, flush = self._queue.get_nowait()
+                    batch.setdefault(path, []).append(line)
+                    if flush:
+                        flush_paths.add(path)
+            except queue.Empty:
+                pass
+            for path, lines in batch.items():
+                try:
+                    fp = self._file(path)
+                    fp.write(b"".join(lines))
+                    if path in flush_paths:
+                        fp.flush()
+                except OSError:
+                    # Logging must never take down the request path
+                    self._files.pop(path, None)
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Best-effort wait for queued events to reach disk (shutdown hook)."""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for fp in list(self._files.values()):
+            try:
+                fp.flush()
+            except OSError:
+                pass
 
+
+def iter_log_records(path: Path):
+    """Yield records from an interaction log in either on-disk format."""
+    if path.suffix == ".msgpack":
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to read binary interaction logs")
+        with path.open("rb") as fp:
+            while header := fp.read(4):
+                (length,) = struct.unpack("<I", header)
+                yield msgpack.unpackb(fp.read(length))
+    else:
+        with path.open("rb") as fp:
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
+
+
+interaction_logger = InteractionLogger()
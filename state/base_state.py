@@ -22,6 +22,7 @@ class CourseState(BaseState):
     practice_quizzes_per_module: int
     needs_lab_module: bool
     custom_prompt: str  # Optional custom instructions for course building
+    xdp_use_llm: bool  # Opt-in flag: generate XDP via Gemini instead of the default builder
     
     # Agent Outputs
     research_findings: Optional[Dict[str, Any]]  # Key areas, topics, objectives
@@ -1,19 +1,41 @@
 """Streamlit UI for Course Builder - Coursera-like interface."""
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
+import html
 import json
-import sys
 import os
+import re
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from main import run_course_builder, initialize_state
-from utils.results_saver import ResultsSaver
+from utils.results_saver import get_saver
+from ui.components import (
+    render_module_structure_review,
+    render_content_review,
+    render_quiz_review,
+    get_feedback_form,
+)
 from ui.progress_display import display_progress_ui, display_workflow_progress_bar
 from ui.real_time_updates import display_step_progress, display_content_as_ready
 
+# orjson writes feedback files straight to UTF-8 bytes; fall back to the
+# stdlib encoder when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Created once at import instead of on every feedback-submit rerun
+COURSE_OUTPUTS = Path("course_outputs")
+COURSE_OUTPUTS.mkdir(exist_ok=True)
+
 
 # Page configuration - Coursera-inspired
 st.set_page_config(
@@ -28,233 +50,351 @@ st.set_page_config(
     }
 )
 
-# Custom CSS for Coursera-like styling
-st.markdown("""
-<style>
-    /* Coursera-inspired theme */
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        color: #1a73e8;
-        margin-bottom: 1rem;
-        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-    }
-    
-    /* Module cards - Coursera style */
-    .module-card {
-        background: white;
-        border-radius: 8px;
-        padding: 1.5rem;
-        margin-bottom: 1rem;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.12), 0 1px 2px rgba(0,0,0,0.24);
-        border-left: 4px solid #1a73e8;
-        transition: box-shadow 0.3s ease;
-    }
-    
-    .module-card:hover {
-        box-shadow: 0 3px 6px rgba(0,0,0,0.16), 0 3px 6px rgba(0,0,0,0.23);
-    }
-    
-    /* Lesson items */
-    .lesson-item {
-        padding: 0.75rem 1rem;
-        margin: 0.5rem 0;
-        background: #f8f9fa;
-        border-radius: 4px;
-        border-left: 3px solid #34a853;
-        transition: background-color 0.2s ease;
-    }
-    
-    .lesson-item:hover {
-        background: #e8f0fe;
-    }
-    
-    /* Quiz badges - Coursera style */
-    .quiz-badge {
-        display: inline-block;
-        padding: 0.375rem 0.875rem;
-        border-radius: 16px;
-        font-size: 0.875rem;
-        font-weight: 500;
-        margin: 0.25rem;
-        letter-spacing: 0.3px;
-    }
-    
-    .graded-badge {
-        background: #ea4335;
-        color: white;
-        box-shadow: 0 1px 2px rgba(234, 67, 53, 0.3);
-    }
-    
-    .practice-badge {
-        background: #fbbc04;
-        color: #202124;
-        box-shadow: 0 1px 2px rgba(251, 188, 4, 0.3);
-    }
-    
-    /* Progress bar */
-    .progress-bar {
-        height: 8px;
-        background: #e0e0e0;
-        border-radius: 4px;
-        margin: 1rem 0;
-        overflow: hidden;
-    }
-    
-    .progress-fill {
-        height: 100%;
-        background: linear-gradient(90deg, #1a73e8 0%, #4285f4 100%);
-        border-radius: 4px;
-        transition: width 0.3s ease;
-    }
-    
-    /* Coursera-style buttons */
-    .stButton > button {
-        background-color: #1a73e8;
-        color: white;
-        border-radius: 4px;
-        border: none;
-        padding: 0.5rem 1.5rem;
-        font-weight: 500;
-        transition: background-color 0.2s ease, box-shadow 0.2s ease;
-    }
-    
-    .stButton > button:hover {
-        background-color: #1557b0;
-        box-shadow: 0 2px 4px rgba(26, 115, 232, 0.3);
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background-color: #f8f9fa;
-    }
-    
-    /* Main content area */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Metric cards */
-    [data-testid="stMetricValue"] {
-        font-size: 2rem;
-        font-weight: 600;
-        color: #1a73e8;
-    }
-    
-    /* Expander styling */
-    .streamlit-expanderHeader {
-        font-weight: 600;
-        color: #202124;
-    }
-    
-    /* Input fields */
-    .stTextInput > div > div > input {
-        border-radius: 4px;
-        border: 1px solid #dadce0;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #1a73e8;
-        box-shadow: 0 0 0 2px rgba(26, 115, 232, 0.1);
-    }
-    
-    /* Selectbox styling */
-    .stSelectbox > div > div {
-        border-radius: 4px;
-    }
-    
-    /* Info boxes */
-    .stInfo {
-        background-color: #e8f0fe;
-        border-left: 4px solid #1a73e8;
-        border-radius: 4px;
-    }
-    
-    .stSuccess {
-        background-color: #e6f4ea;
-        border-left: 4px solid #34a853;
-        border-radius: 4px;
-    }
-    
-    .stWarning {
-        background-color: #fef7e0;
-        border-left: 4px solid #fbbc04;
-        border-radius: 4px;
-    }
-    
-    .stError {
-        background-color: #fce8e6;
-        border-left: 4px solid #ea4335;
-        border-radius: 4px;
+# Custom CSS for Coursera-like styling, kept in a static file and loaded
+# once per server process: the style tag itself must still be emitted on
+# every rerun (Streamlit drops elements that aren't re-rendered), but the
+# file read and string assembly happen a single time.
+@st.cache_resource(show_spinner=False)
+def _theme_html() -> str:
+    css = (Path(__file__).parent / "static" / "theme.css").read_text(encoding="utf-8")
+    return f"<style>\n{css}</style>"
+
+
+st.markdown(_theme_html(), unsafe_allow_html=True)
+
+
+def _write_feedback(thread_id, kind, feedback):
+    """Save review feedback to the file the paused workflow polls for."""
+    payload = {kind: feedback}
+    if orjson is not None:
+        body = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        body = json.dumps(payload, indent=2).encode("utf-8")
+    # Encode once to bytes, write to a sidecar, then rename: the rename
+    # is atomic, so the polling workflow can never read a partial file,
+    # and no TextIOWrapper sits on the click-to-resume path.
+    path = COURSE_OUTPUTS / f"{thread_id}_feedback_{kind}.json"
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+
+# The display_* helpers below are fragments: their output is a pure
+# function of the course dicts they receive, so interactions inside one
+# card (expanders, etc.) rerun only that card instead of redrawing every
+# module on the page.
+
+
+# Short-TTL cache over result files: reruns triggered by unrelated widget
+# interactions reuse the parsed dict instead of re-reading and re-parsing
+# JSON from disk. Two seconds matches the polling cadence, so fresh
+# workflow output still shows up within one tick.
+@st.cache_data(ttl=2, show_spinner=False)
+def _get_latest(result_type: str, thread_id: str):
+    return get_saver().get_latest_result(result_type, thread_id)
+
+
+# Interrupt priority: quizzes > content > structure (workflow order)
+_INTERRUPT_ORDER = ("quizzes", "content", "structure")
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _active_interrupt(thread_id: str):
+    """
+    Find the workflow's active interrupt with one directory scan.
+
+    One scandir replaces three stat+open+parse probes per polling tick;
+    only the highest-priority interrupt file actually present is parsed.
+    Returns (interrupt_type, parsed record) or (None, None).
+    """
+    prefix = f"{thread_id}_interrupt_"
+    try:
+        with os.scandir(COURSE_OUTPUTS) as it:
+            present = {entry.name for entry in it if entry.name.startswith(prefix)}
+    except FileNotFoundError:
+        return None, None
+    for kind in _INTERRUPT_ORDER:
+        if f"{prefix}{kind}.json" in present:
+            return kind, _get_latest(f"interrupt_{kind}", thread_id)
+    return None, None
+
+
+# One pool per server process (module top-level code reruns per script
+# run, so the pool must live behind cache_resource). Workflows run here
+# instead of on the script thread, which keeps the websocket heartbeat
+# and the polling fragment alive while generation is in flight.
+@st.cache_resource(show_spinner=False)
+def _workflow_executor():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="ui-workflow")
+
+
+@st.cache_data(show_spinner=False)
+def _build_xdp_index(xdp_content):
+    """Map module_id -> (name, description) from the design patterns."""
+    if not xdp_content:
+        return {}
+    xdp_data = xdp_content.get('data', {})
+    if not isinstance(xdp_data, dict):
+        return {}
+    # Tuple values: one allocation per pattern and index access on the
+    # consumer side instead of a nested dict per module
+    return {
+        pattern['module_id']: (pattern.get('module_name', ''), pattern.get('module_description', ''))
+        for pattern in xdp_data.get('design_patterns', [])
+        if pattern.get('module_id')
     }
-</style>
-""", unsafe_allow_html=True)
 
 
-def display_module_card(module, module_num):
-    """Display a module card in Coursera-like style."""
+@st.cache_data(show_spinner=False)
+def _enhance_modules(modules_data, xdp_content):
+    """
+    Merge XDP names and descriptions into the module dicts.
+
+    Cached on the inputs so the O(modules x patterns) merge runs once per
+    course instead of on every rerun; enhanced modules are copies, so the
+    cached source dicts are never mutated.
+    """
+    xdp_design_patterns = _build_xdp_index(xdp_content)
+    enhanced = []
+    for module in modules_data:
+        xdp_info = xdp_design_patterns.get(module.get('module_id'))
+        if xdp_info:
+            name, description = xdp_info
+            module = dict(module)
+            # Use XDP module_name if available and different
+            if name:
+                module['xdp_module_name'] = name
+            # Add XDP description
+            if description:
+                module['xdp_module_description'] = description
+        enhanced.append(module)
+    return enhanced
+
+
+# First run of digits in a duration string like "4 weeks"
+_WEEKS_RE = re.compile(r'(\d+)')
+
+
+@lru_cache(maxsize=32)
+def _hours_per_week(duration, total_lessons):
+    """Estimate weekly hours from the duration string (rough calculation)."""
+    if "week" not in duration.lower():
+        return "10"
+    match = _WEEKS_RE.search(duration)
+    weeks = int(match.group(1)) if match else 4
+    estimated_hours = total_lessons * 1.5  # Assume 1.5 hours per lesson
+    return str(int(estimated_hours / weeks)) if weeks > 0 else "10"
+
+
+_LEVEL_DESCRIPTIONS = {
+    'Basic': 'No prior experience required',
+    'Intermediate': 'Some foundational knowledge recommended',
+    'Advanced': 'Prior experience in the field recommended'
+}
+
+
+def _build_stats_html(course_title, course_description, total_modules, total_lessons,
+                      learner_level, level_desc, duration, hours_per_week,
+                      total_quizzes, graded_quizzes, practice_quizzes):
+    """
+    Assemble the course title block and statistics card as one HTML string.
+
+    A CSS flex row replaces st.columns(5) and its per-cell markdown
+    calls, so the whole header crosses the websocket as a single element
+    instead of a dozen. Cell styling lives in theme.css (.cstat classes);
+    the generated HTML carries class names rather than repeating ~300
+    bytes of inline style per cell.
+    """
+    parts = [f"""
+    <div style="margin-bottom: 2rem;">
+        <h1 style="font-size: 2.5rem; font-weight: 700; color: #202124; margin-bottom: 1rem;">
+            {course_title}
+        </h1>
+        <p style="font-size: 1.1rem; color: #5f6368; line-height: 1.6; max-width: 800px;">
+            {course_description}
+        </p>
+    </div>
+    <div class="cstat-row">
+    """]
+    parts.append(f"""
+        <div class="cstat">
+            <div class="cstat-big">{total_modules}</div>
+            <div class="cstat-lbl">modules</div>
+            <div class="cstat-sub">Gain insight into a topic and learn the fundamentals.</div>
+        </div>
+    """)
+    parts.append(f"""
+        <div class="cstat">
+            <div class="cstat-big">{total_lessons}</div>
+            <div class="cstat-lbl">lessons</div>
+            <div class="cstat-sub">Comprehensive content with examples and exercises.</div>
+        </div>
+    """)
+    parts.append(f"""
+        <div class="cstat">
+            <div class="cstat-mid">{learner_level} level</div>
+            <div class="cstat-sub">{level_desc}</div>
+        </div>
+    """)
+    parts.append(f"""
+        <div class="cstat">
+            <div class="cstat-mid" style="font-size: 1.2rem;">Flexible schedule</div>
+            <div class="cstat-sub">
+                {duration} at {hours_per_week} hours per week<br>
+                Learn at your own pace
+            </div>
+        </div>
+    """)
+    parts.append(f"""
+        <div class="cstat">
+            <div class="cstat-big">{total_quizzes}</div>
+            <div class="cstat-lbl">assessments</div>
+            <div class="cstat-sub">{graded_quizzes} graded, {practice_quizzes} practice quizzes</div>
+        </div>
+    """)
+    parts.append('</div>')
+    return "".join(parts)
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _module_card_html(module, module_num):
+    """
+    Pre-render the pure-HTML portion of a module card.
+
+    The card is a deterministic function of the module dict, so the
+    string build is cached on its inputs; steady-state reruns fetch the
+    finished HTML instead of re-assembling it per module per rerun.
+    """
     # Use XDP module name if available, otherwise use regular module name
     module_name = module.get('xdp_module_name') or module.get('module_name', 'Untitled')
-    
-    st.markdown(f"""
+
+    parts = [f"""
     <div class="module-card">
         <h3 style="color: #1a73e8; margin-bottom: 0.5rem;">Module {module_num}: {module_name}</h3>
         <p style="color: #666; margin-bottom: 1rem;">{module.get('duration_allocation', 'N/A')}</p>
     </div>
-    """, unsafe_allow_html=True)
-    
-    # Display XDP module description if available
+    """]
+
+    # XDP module description if available
     xdp_description = module.get('xdp_module_description')
     if xdp_description:
-        st.markdown(f"""
+        parts.append(f"""
         <div style="background: #f8f9fa; padding: 1rem; border-radius: 4px; margin-bottom: 1rem; border-left: 3px solid #1a73e8;">
             <p style="color: #5f6368; margin: 0; line-height: 1.6;"><strong>Module Overview:</strong> {xdp_description}</p>
         </div>
-        """, unsafe_allow_html=True)
-    
-    # Module objectives
-    if module.get('module_objectives'):
-        with st.expander("📋 Module Objectives", expanded=False):
-            for obj in module.get('module_objectives', []):
-                st.markdown(f"• {obj}")
-    
+        """)
+
     # Lessons
     lessons = module.get('lessons', [])
     if lessons:
-        st.markdown("### 📖 Lessons")
+        parts.append('<h3>📖 Lessons</h3>')
         for i, lesson in enumerate(lessons, 1):
-            st.markdown(f"""
+            parts.append(f"""
             <div class="lesson-item">
                 <strong>Lesson {i}: {lesson.get('lesson_name', 'Untitled')}</strong><br>
                 <small>Duration: {lesson.get('estimated_duration', 'N/A')}</small>
             </div>
-            """, unsafe_allow_html=True)
-            
-            # Lesson objectives
-            if lesson.get('lesson_objectives'):
-                with st.expander(f"Objectives for Lesson {i}", expanded=False):
-                    for obj in lesson.get('lesson_objectives', []):
-                        st.markdown(f"• {obj}")
-    
+            """)
+
     # Quiz plan
     quiz_plan = module.get('quiz_plan', {})
     if quiz_plan:
         graded = quiz_plan.get('graded', 0)
         practice = quiz_plan.get('practice', 0)
         if graded > 0 or practice > 0:
-            st.markdown("### 📝 Assessments")
+            parts.append('<h3>📝 Assessments</h3>')
             if graded > 0:
-                st.markdown(f'<span class="quiz-badge graded-badge">Graded: {graded}</span>', unsafe_allow_html=True)
+                parts.append(f'<span class="quiz-badge graded-badge">Graded: {graded}</span>')
             if practice > 0:
-                st.markdown(f'<span class="quiz-badge practice-badge">Practice: {practice}</span>', unsafe_allow_html=True)
-    
+                parts.append(f'<span class="quiz-badge practice-badge">Practice: {practice}</span>')
+
+    return "".join(parts)
+
+
+@st.fragment
+def display_module_card(module, module_num):
+    """Display a module card in Coursera-like style."""
+    # All pure-HTML pieces of the card land in one st.html call: a
+    # 10-module x 5-lesson course becomes ~10 front-end elements instead
+    # of 50+, and none of them pass through the markdown parser.
+    # Expanders must stay real widgets, so they follow the block.
+    st.html(_module_card_html(module, module_num))
+
+    lessons = module.get('lessons', [])
+
+    # Module objectives
+    if module.get('module_objectives'):
+        with st.expander("📋 Module Objectives", expanded=False):
+            for obj in module.get('module_objectives', []):
+                st.markdown(f"• {obj}")
+
+    # Lesson objectives (labelled per lesson since they sit below the list)
+    for i, lesson in enumerate(lessons, 1):
+        if lesson.get('lesson_objectives'):
+            with st.expander(f"Objectives for Lesson {i}", expanded=False):
+                for obj in lesson.get('lesson_objectives', []):
+                    st.markdown(f"• {obj}")
+
     st.markdown("---")
 
 
+@st.cache_data(show_spinner=False)
+def _lesson_markdown(lesson):
+    """
+    Assemble a lesson's body as one markdown string.
+
+    Cached per lesson dict: while content is still streaming in, only
+    the lesson that actually changed is rebuilt - the stable ones come
+    straight from the cache - and each lesson ships as a single
+    markdown element instead of two per section.
+    """
+    blocks = []
+    
+    # Each field is bound once (walrus) instead of looked up twice
+    
+    # Introduction
+    if introduction := lesson.get('introduction'):
+        blocks.append("#### 📌 Introduction")
+        blocks.append(introduction)
+    
+    # Main content
+    if main_content := lesson.get('main_content'):
+        blocks.append("#### 📚 Main Content")
+        blocks.append(main_content)
+    
+    # Examples
+    if examples := lesson.get('examples'):
+        blocks.append("#### 💡 Examples")
+        blocks.append("\n".join(f"- {example}" for example in examples))
+    
+    # Case studies
+    if case_studies := lesson.get('case_studies'):
+        blocks.append("#### 🔬 Case Studies")
+        blocks.append("\n".join(f"- {case}" for case in case_studies))
+    
+    # Practice exercises
+    if practice_exercises := lesson.get('practice_exercises'):
+        blocks.append("#### ✏️ Practice Exercises")
+        blocks.append("\n".join(f"- {exercise}" for exercise in practice_exercises))
+    
+    # Summary
+    if summary := lesson.get('summary'):
+        blocks.append("#### 📝 Summary")
+        blocks.append(summary)
+    
+    # Visual suggestions
+    if visual_suggestions := lesson.get('visual_suggestions'):
+        blocks.append("#### 🎨 Visual Suggestions")
+        blocks.append("\n".join(f"- {visual}" for visual in visual_suggestions))
+    
+    return "\n\n".join(blocks)
+
+
+@st.fragment
 def display_lesson_content(lesson, transcript=None):
     """Display detailed lesson content."""
-    st.markdown(f"### {lesson.get('lesson_name', 'Untitled Lesson')}")
+    # Plain heading, no markdown in the payload
+    st.subheader(lesson.get('lesson_name', 'Untitled Lesson'))
     
     # Video Transcript (show first if available)
     if transcript or lesson.get('video_transcript'):
@@ -271,93 +411,108 @@ def display_lesson_content(lesson, transcript=None):
             
             st.markdown("---")
     
-    # Introduction
-    if lesson.get('introduction'):
-        st.markdown("#### 📌 Introduction")
-        st.markdown(lesson['introduction'])
-    
-    # Main content
-    if lesson.get('main_content'):
-        st.markdown("#### 📚 Main Content")
-        st.markdown(lesson['main_content'])
-    
-    # Examples
-    if lesson.get('examples'):
-        st.markdown("#### 💡 Examples")
-        for example in lesson['examples']:
-            st.markdown(f"- {example}")
-    
-    # Case studies
-    if lesson.get('case_studies'):
-        st.markdown("#### 🔬 Case Studies")
-        for case in lesson['case_studies']:
-            st.markdown(f"- {case}")
-    
-    # Practice exercises
-    if lesson.get('practice_exercises'):
-        st.markdown("#### ✏️ Practice Exercises")
-        for exercise in lesson['practice_exercises']:
-            st.markdown(f"- {exercise}")
-    
-    # Summary
-    if lesson.get('summary'):
-        st.markdown("#### 📝 Summary")
-        st.markdown(lesson['summary'])
-    
-    # Visual suggestions
-    if lesson.get('visual_suggestions'):
-        st.markdown("#### 🎨 Visual Suggestions")
-        for visual in lesson['visual_suggestions']:
-            st.markdown(f"- {visual}")
+    # Lesson body: one cached markdown string, one element
+    if body := _lesson_markdown(lesson):
+        st.markdown(body)
 
 
+@st.fragment
 def display_quiz(quiz):
     """Display quiz in a structured format."""
     quiz_type = quiz.get('quiz_type', 'unknown')
     badge_class = "graded-badge" if quiz_type == "graded" else "practice-badge"
     
-    st.markdown(f"""
+    # Pure HTML, so skip the markdown parser entirely. Generated text is
+    # escaped before interpolation - quiz content routinely contains <, >
+    # and & (e.g. List<String>, a && b).
+    st.html(f"""
     <div class="module-card">
         <h4 style="color: #1a73e8;">
             <span class="quiz-badge {badge_class}">{quiz_type.upper()}</span>
-            {quiz.get('quiz_id', 'Quiz')}
+            {html.escape(str(quiz.get('quiz_id', 'Quiz')))}
         </h4>
-        <p>Module: {quiz.get('module_id', 'N/A')}</p>
+        <p>Module: {html.escape(str(quiz.get('module_id', 'N/A')))}</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     questions = quiz.get('questions', [])
     if questions:
         st.markdown(f"**Total Questions: {len(questions)}**")
         
-        with st.expander("View Questions", expanded=False):
-            for i, question in enumerate(questions, 1):
-                st.markdown(f"**Q{i}: {question.get('question_text', question.get('question', 'N/A'))}**")
-                
-                # Options for multiple choice
-                if question.get('options'):
-                    options = question['options']
-                    if isinstance(options, list) and len(options) > 0:
-                        if isinstance(options[0], dict):
-                            # Structured options
-                            for opt in options:
-                                st.markdown(f"  - {opt.get('option_text', opt.get('option', 'N/A'))}")
-                        else:
-                            # Simple list
-                            for opt in options:
-                                st.markdown(f"  - {opt}")
-                
-                # Correct answer
-                if question.get('correct_answer'):
-                    with st.expander("Show Answer", expanded=False):
-                        st.markdown(f"**Answer:** {question['correct_answer']}")
-                
-                # Explanation
-                if question.get('explanation'):
-                    with st.expander("Explanation", expanded=False):
-                        st.markdown(question['explanation'])
-                
-                st.markdown("---")
+        # Questions render as native <details> elements in one markdown
+        # call: an N-question quiz previously created 2N+1 expander
+        # widgets, and per-widget overhead dominates rerun time. The
+        # browser handles open/close with zero Streamlit round-trips.
+        parts = ['<details><summary><strong>View Questions</strong></summary>']
+        for i, question in enumerate(questions, 1):
+            question_text = html.escape(str(question.get('question_text', question.get('question', 'N/A'))))
+            parts.append(f"<details><summary><strong>Q{i}: {question_text}</strong></summary>")
+            
+            # Options for multiple choice
+            if question.get('options'):
+                options = question['options']
+                if isinstance(options, list) and len(options) > 0:
+                    parts.append('<ul>')
+                    if isinstance(options[0], dict):
+                        # Structured options
+                        for opt in options:
+                            parts.append(f"<li>{html.escape(str(opt.get('option_text', opt.get('option', 'N/A'))))}</li>")
+                    else:
+                        # Simple list
+                        for opt in options:
+                            parts.append(f"<li>{html.escape(str(opt))}</li>")
+                    parts.append('</ul>')
+            
+            # Correct answer
+            if question.get('correct_answer'):
+                parts.append(f"<details><summary>Show Answer</summary><p><strong>Answer:</strong> {html.escape(str(question['correct_answer']))}</p></details>")
+            
+            # Explanation
+            if question.get('explanation'):
+                parts.append(f"<details><summary>Explanation</summary><p>{html.escape(str(question['explanation']))}</p></details>")
+            
+            parts.append('</details><hr>')
+        parts.append('</details>')
+        st.html("".join(parts))
+
+
+@st.fragment(run_every=2)
+def _workflow_progress_panel(thread_id):
+    """
+    Poll progress and stream content on a 2-second cadence.
+
+    As a fragment, only this panel reruns per tick; the rest of the page
+    (CSS, sidebar, forms, interrupt checks) renders only on full reruns.
+    Also watches the background workflow future and promotes its result
+    into session state when generation finishes.
+    """
+    future = st.session_state.get('workflow_future')
+    if future is not None and future.done():
+        try:
+            final_state, thread_id = future.result()
+            st.session_state.course_data = final_state
+            st.session_state.thread_id = thread_id
+            st.session_state.workflow_complete = True
+            st.success("✅ Course generated successfully!")
+            st.balloons()
+        except Exception as e:
+            st.error(f"Error generating course: {str(e)}")
+            st.exception(e)
+        finally:
+            st.session_state.workflow_running = False
+            st.session_state.workflow_started = False
+            st.session_state.workflow_future = None
+        st.rerun()
+        return
+
+    progress_container = st.empty()
+    content_container = st.container()
+
+    # Display current step progress (disappears when content is ready)
+    display_step_progress(thread_id, progress_container)
+
+    # Display content as it becomes available
+    display_content_as_ready(thread_id, content_container)
 
 
 def main():
@@ -499,31 +654,13 @@ def main():
         
         # Check for interrupts and show inline review UI FIRST (before workflow execution)
         thread_id = st.session_state.get('thread_id', 'default')
-        saver = ResultsSaver()
         
         # Display workflow progress bar
         if st.session_state.get('workflow_running') or st.session_state.get('workflow_complete'):
             display_workflow_progress_bar(thread_id)
         
-        interrupt_structure = saver.get_latest_result("interrupt_structure", thread_id)
-        interrupt_content = saver.get_latest_result("interrupt_content", thread_id)
-        interrupt_quizzes = saver.get_latest_result("interrupt_quizzes", thread_id)
-        
-        # Determine which interrupt is active (most recent)
-        # Priority: quizzes > content > structure (workflow order)
-        active_interrupt = None
-        active_type = None
-        
-        # Determine active interrupt (most recent one)
-        if interrupt_quizzes:
-            active_interrupt = interrupt_quizzes
-            active_type = "quizzes"
-        elif interrupt_content:
-            active_interrupt = interrupt_content
-            active_type = "content"
-        elif interrupt_structure:
-            active_interrupt = interrupt_structure
-            active_type = "structure"
+        # Determine which interrupt is active; one scan, at most one parse
+        active_type, active_interrupt = _active_interrupt(thread_id)
         
         # Show review UI if active interrupt detected - THIS MUST APPEAR BEFORE WORKFLOW SECTION
         if active_interrupt:
@@ -534,70 +671,81 @@ def main():
             feedback_submitted = False
             
             # Structure review
-            if active_type == "structure" and interrupt_structure:
+            if active_type == "structure":
                 st.markdown("### 1️⃣ Module Structure Review")
-                structure_data = interrupt_structure.get('data', {}).get('state', {})
-                modules = structure_data.get('module_structure', {}).get('modules', [])
+                # Direct subscripts: on the hot path the keys exist, and a
+                # miss costs one exception instead of a chain of throwaway
+                # default dicts every polling tick
+                try:
+                    modules = active_interrupt['data']['state']['module_structure']['modules']
+                except (KeyError, TypeError):
+                    modules = []
                 
                 if modules:
-                    from ui.components import render_module_structure_review, get_feedback_form
                     render_module_structure_review(modules)
                     
                     feedback = get_feedback_form("structure")
                     
                     if st.button("✅ Submit Structure Feedback", type="primary", key="submit_structure"):
                         # Save feedback to file for workflow to pick up
-                        feedback_file = f"course_outputs/{thread_id}_feedback_structure.json"
-                        os.makedirs("course_outputs", exist_ok=True)
-                        with open(feedback_file, "w", encoding="utf-8") as f:
-                            json.dump({"structure": feedback}, f, indent=2)
+                        _write_feedback(thread_id, "structure", feedback)
                         st.success("✅ Feedback submitted! Workflow will continue...")
                         st.session_state.structure_feedback_submitted = True
                         feedback_submitted = True
+                        # Drop cached interrupt state so the next rerun sees
+                        # the workflow moving on rather than the stale pause
+                        _get_latest.clear()
+                        _active_interrupt.clear()
                         st.rerun()
             
             # Content review
-            elif active_type == "content" and interrupt_content:
+            elif active_type == "content":
                 st.markdown("### 2️⃣ Content Review")
-                content_data = interrupt_content.get('data', {}).get('state', {})
-                lessons = content_data.get('course_content', [])
+                try:
+                    lessons = active_interrupt['data']['state']['course_content']
+                except (KeyError, TypeError):
+                    lessons = []
                 
                 if lessons:
-                    from ui.components import render_content_review, get_feedback_form
                     render_content_review(lessons)
                     
                     feedback = get_feedback_form("content")
                     
                     if st.button("✅ Submit Content Feedback", type="primary", key="submit_content"):
-                        feedback_file = f"course_outputs/{thread_id}_feedback_content.json"
-                        os.makedirs("course_outputs", exist_ok=True)
-                        with open(feedback_file, "w", encoding="utf-8") as f:
-                            json.dump({"content": feedback}, f, indent=2)
+                        # Save feedback to file for workflow to pick up
+                        _write_feedback(thread_id, "content", feedback)
                         st.success("✅ Feedback submitted! Workflow will continue...")
                         st.session_state.content_feedback_submitted = True
                         feedback_submitted = True
+                        # Drop cached interrupt state so the next rerun sees
+                        # the workflow moving on rather than the stale pause
+                        _get_latest.clear()
+                        _active_interrupt.clear()
                         st.rerun()
             
             # Quiz review
-            elif active_type == "quizzes" and interrupt_quizzes:
+            elif active_type == "quizzes":
                 st.markdown("### 3️⃣ Quiz Review")
-                quiz_data = interrupt_quizzes.get('data', {}).get('state', {})
-                quizzes = quiz_data.get('quizzes', [])
+                try:
+                    quizzes = active_interrupt['data']['state']['quizzes']
+                except (KeyError, TypeError):
+                    quizzes = []
                 
                 if quizzes:
-                    from ui.components import render_quiz_review, get_feedback_form
                     render_quiz_review(quizzes)
                     
                     feedback = get_feedback_form("quizzes")
                     
                     if st.button("✅ Submit Quiz Feedback", type="primary", key="submit_quizzes"):
-                        feedback_file = f"course_outputs/{thread_id}_feedback_quizzes.json"
-                        os.makedirs("course_outputs", exist_ok=True)
-                        with open(feedback_file, "w", encoding="utf-8") as f:
-                            json.dump({"quizzes": feedback}, f, indent=2)
+                        # Save feedback to file for workflow to pick up
+                        _write_feedback(thread_id, "quizzes", feedback)
                         st.success("✅ Feedback submitted! Workflow will continue...")
                         st.session_state.quiz_feedback_submitted = True
                         feedback_submitted = True
+                        # Drop cached interrupt state so the next rerun sees
+                        # the workflow moving on rather than the stale pause
+                        _get_latest.clear()
+                        _active_interrupt.clear()
                         st.rerun()
             
             # Don't run workflow if waiting for feedback
@@ -614,63 +762,37 @@ def main():
             
             thread_id = st.session_state.get('thread_id', 'default')
             
-            # Create containers for step-by-step updates
-            progress_container = st.empty()
-            content_container = st.container()
-            
-            # Display current step progress (disappears when content is ready)
-            message_showing = display_step_progress(thread_id, progress_container)
-            
-            # Display content as it becomes available
-            display_content_as_ready(thread_id, content_container)
+            # Scoped polling: the fragment reruns itself every 2 seconds
+            _workflow_progress_panel(thread_id)
             
-            st.info("💡 **Tip:** This page auto-refreshes every 2 seconds to show latest progress. Stay on this page.")
+            st.info("💡 **Tip:** Progress updates every 2 seconds. Stay on this page.")
             
-            # Check if workflow has been started
+            # Launch the workflow once, in a background thread. The script
+            # thread returns immediately; the fragment above polls progress
+            # and picks up the result when the future completes.
             if not st.session_state.get('workflow_started', False):
                 st.session_state.workflow_started = True
-                try:
-                    user_input = st.session_state.get('user_input')
-                    thread_id = st.session_state.get('thread_id', 'default')
-                    
-                    # Run workflow (this will block, but progress is shown via progress file)
-                    final_state, thread_id = run_course_builder(user_input, thread_id)
-                    st.session_state.course_data = final_state
-                    st.session_state.thread_id = thread_id
-                    st.session_state.workflow_running = False
-                    st.session_state.workflow_complete = True
-                    st.session_state.workflow_started = False
-                    st.success("✅ Course generated successfully!")
-                    st.balloons()
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"Error generating course: {str(e)}")
-                    st.session_state.workflow_running = False
-                    st.session_state.workflow_started = False
-                    st.exception(e)
-            else:
-                # Auto-refresh every 2 seconds to show updates
-                import time
-                time.sleep(2)
-                st.rerun()
+                user_input = st.session_state.get('user_input')
+                st.session_state.workflow_future = _workflow_executor().submit(
+                    run_course_builder, user_input, thread_id
+                )
     
     # View Course page
     elif page == "📊 View Course":
         st.header("View Generated Course")
         
         thread_id = st.session_state.get('thread_id', 'default')
-        saver = ResultsSaver()
         
         # Display workflow progress bar
         display_workflow_progress_bar(thread_id)
         
         # Load course data
-        module_structure = saver.get_latest_result("module_structure", thread_id)
-        course_content = saver.get_latest_result("course_content", thread_id)
-        quizzes = saver.get_latest_result("quizzes", thread_id)
-        final_course = saver.get_latest_result("final_course", thread_id)
-        xdp_content = saver.get_latest_result("xdp_content", thread_id)
-        video_transcripts = saver.get_latest_result("video_transcripts", thread_id)
+        module_structure = _get_latest("module_structure", thread_id)
+        course_content = _get_latest("course_content", thread_id)
+        quizzes = _get_latest("quizzes", thread_id)
+        final_course = _get_latest("final_course", thread_id)
+        xdp_content = _get_latest("xdp_content", thread_id)
+        video_transcripts = _get_latest("video_transcripts", thread_id)
         
         if not module_structure:
             st.info("No course data found. Please create a course first.")
@@ -684,31 +806,8 @@ def main():
                 # Try legacy structure
                 modules_data = data.get('module_structure', {}).get('modules', [])
             
-            # Extract XDP design patterns for module names and descriptions
-            xdp_design_patterns = {}
-            if xdp_content:
-                xdp_data = xdp_content.get('data', {})
-                if isinstance(xdp_data, dict):
-                    design_patterns = xdp_data.get('design_patterns', [])
-                    for pattern in design_patterns:
-                        module_id = pattern.get('module_id')
-                        if module_id:
-                            xdp_design_patterns[module_id] = {
-                                'module_name': pattern.get('module_name', ''),
-                                'module_description': pattern.get('module_description', '')
-                            }
-            
-            # Enhance modules_data with XDP information if available
-            for module in modules_data:
-                module_id = module.get('module_id')
-                if module_id in xdp_design_patterns:
-                    xdp_info = xdp_design_patterns[module_id]
-                    # Use XDP module_name if available and different
-                    if xdp_info.get('module_name'):
-                        module['xdp_module_name'] = xdp_info['module_name']
-                    # Add XDP description
-                    if xdp_info.get('module_description'):
-                        module['xdp_module_description'] = xdp_info['module_description']
+            # Merge XDP names/descriptions into the modules (cached)
+            modules_data = _enhance_modules(modules_data, xdp_content)
             
             # Handle course content - check multiple possible structures
             content_data = []
@@ -772,128 +871,32 @@ def main():
                     "duration": module_structure.get('data', {}).get('course_duration', '4 weeks')
                 }
             
-            # Calculate statistics
+            # Calculate statistics (one pass over the quiz list instead
+            # of two throwaway filtered lists)
             total_modules = len(modules_data)
             total_lessons = len(content_data) if content_data else sum(len(m.get('lessons', [])) for m in modules_data)
             total_quizzes = len(quizzes_data)
-            graded_quizzes = len([q for q in quizzes_data if q.get('quiz_type') == 'graded'])
-            practice_quizzes = len([q for q in quizzes_data if q.get('quiz_type') == 'practice'])
+            graded_quizzes = practice_quizzes = 0
+            for q in quizzes_data:
+                quiz_type = q.get('quiz_type')
+                graded_quizzes += quiz_type == 'graded'
+                practice_quizzes += quiz_type == 'practice'
             
             # Course title and description (Coursera style) - shown first
             course_title = course_info.get('title', 'Course')
             course_description = course_info.get('description', f'Comprehensive course on {course_title}')
             
-            st.markdown(f"""
-            <div style="margin-bottom: 2rem;">
-                <h1 style="font-size: 2.5rem; font-weight: 700; color: #202124; margin-bottom: 1rem;">
-                    {course_title}
-                </h1>
-                <p style="font-size: 1.1rem; color: #5f6368; line-height: 1.6; max-width: 800px;">
-                    {course_description}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Coursera-style statistics card (white card with rounded corners)
-            st.markdown("""
-            <div style="background: white; border-radius: 8px; padding: 1.5rem 2rem; margin: 2rem 0; box-shadow: 0 1px 3px rgba(0,0,0,0.12), 0 1px 2px rgba(0,0,0,0.24);">
-            """, unsafe_allow_html=True)
-            
-            # Create 5 columns for statistics (like Coursera)
-            stat_cols = st.columns(5)
-            
-            with stat_cols[0]:
-                st.markdown(f"""
-                <div style="text-align: center; padding: 1rem;">
-                    <div style="font-size: 2.5rem; font-weight: 700; color: #1a73e8; margin-bottom: 0.5rem;">
-                        {total_modules}
-                    </div>
-                    <div style="font-size: 0.9rem; color: #5f6368; font-weight: 500; margin-bottom: 0.25rem;">
-                        modules
-                    </div>
-                    <div style="font-size: 0.75rem; color: #80868b; line-height: 1.4;">
-                        Gain insight into a topic and learn the fundamentals.
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with stat_cols[1]:
-                # Calculate average lesson duration
-                avg_lesson_duration = "30 min"  # Default
-                if modules_data:
-                    durations = [l.get('estimated_duration', '30 min') for m in modules_data for l in m.get('lessons', [])]
-                    if durations:
-                        avg_lesson_duration = durations[0]  # Use first as example
-                
-                st.markdown(f"""
-                <div style="text-align: center; padding: 1rem;">
-                    <div style="font-size: 2.5rem; font-weight: 700; color: #1a73e8; margin-bottom: 0.5rem;">
-                        {total_lessons}
-                    </div>
-                    <div style="font-size: 0.9rem; color: #5f6368; font-weight: 500; margin-bottom: 0.25rem;">
-                        lessons
-                    </div>
-                    <div style="font-size: 0.75rem; color: #80868b; line-height: 1.4;">
-                        Comprehensive content with examples and exercises.
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with stat_cols[2]:
-                learner_level = course_info.get('level', 'intermediate').capitalize()
-                level_description = {
-                    'Basic': 'No prior experience required',
-                    'Intermediate': 'Some foundational knowledge recommended',
-                    'Advanced': 'Prior experience in the field recommended'
-                }
-                desc = level_description.get(learner_level, 'Appropriate for all levels')
-                
-                st.markdown(f"""
-                <div style="text-align: center; padding: 1rem;">
-                    <div style="font-size: 1.5rem; font-weight: 600; color: #1a73e8; margin-bottom: 0.5rem;">
-                        {learner_level} level
-                    </div>
-                    <div style="font-size: 0.75rem; color: #80868b; line-height: 1.4;">
-                        {desc}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with stat_cols[3]:
-                duration = course_info.get('duration', '4 weeks')
-                # Estimate hours per week (rough calculation)
-                hours_per_week = "10"
-                if "week" in duration.lower():
-                    weeks = int(''.join(filter(str.isdigit, duration)) or 4)
-                    estimated_hours = total_lessons * 1.5  # Assume 1.5 hours per lesson
-                    hours_per_week = str(int(estimated_hours / weeks)) if weeks > 0 else "10"
-                
-                st.markdown(f"""
-                <div style="text-align: center; padding: 1rem;">
-                    <div style="font-size: 1.2rem; font-weight: 600; color: #1a73e8; margin-bottom: 0.5rem;">
-                        Flexible schedule
-                    </div>
-                    <div style="font-size: 0.75rem; color: #80868b; line-height: 1.4;">
-                        {duration} at {hours_per_week} hours per week<br>
-                        Learn at your own pace
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with stat_cols[4]:
-                st.markdown(f"""
-                <div style="text-align: center; padding: 1rem;">
-                    <div style="font-size: 2.5rem; font-weight: 700; color: #1a73e8; margin-bottom: 0.5rem;">
-                        {total_quizzes}
-                    </div>
-                    <div style="font-size: 0.9rem; color: #5f6368; font-weight: 500; margin-bottom: 0.25rem;">
-                        assessments
-                    </div>
-                    <div style="font-size: 0.75rem; color: #80868b; line-height: 1.4;">
-                        {graded_quizzes} graded, {practice_quizzes} practice quizzes
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            learner_level = course_info.get('level', 'intermediate').capitalize()
+            level_desc = _LEVEL_DESCRIPTIONS.get(learner_level, 'Appropriate for all levels')
+            
+            duration = course_info.get('duration', '4 weeks')
+            hours_per_week = _hours_per_week(duration, total_lessons)
+            
+            # Title block and Coursera-style statistics card as one element
+            st.html(_build_stats_html(
+                course_title, course_description, total_modules, total_lessons,
+                learner_level, level_desc, duration, hours_per_week,
+                total_quizzes, graded_quizzes, practice_quizzes))
             
             # Add video transcripts statistics if available
             if transcripts_data:
@@ -915,9 +918,6 @@ def main():
                     avg_duration = round(total_video_duration / total_transcripts, 1) if total_transcripts > 0 else 0
                     st.metric("Average Duration", f"{avg_duration} min/lesson")
             
-            # Close the statistics card div
-            st.markdown("</div>", unsafe_allow_html=True)
-            
             st.markdown("---")
             
             # Show all course content in a dedicated section if available
@@ -931,39 +931,52 @@ def main():
                 tab_names = [f"Module {i+1}" for i in range(len(modules_data))]
                 tabs = st.tabs(tab_names)
                 
-                for tab, module in zip(tabs, modules_data):
+                # Index lessons by module id once (normalized to str so
+                # int/str ids compare equal) instead of rescanning
+                # content_data with coercions for every module tab
+                lessons_by_module = defaultdict(list)
+                for lesson in content_data:
+                    lessons_by_module[str(lesson.get('module_id'))].append(lesson)
+                # Identical for every tab, so build it once for the warning
+                available_module_ids = sorted(lessons_by_module)
+                
+                for module_num, (tab, module) in enumerate(zip(tabs, modules_data), start=1):
                     with tab:
-                        display_module_card(module, modules_data.index(module) + 1)
+                        display_module_card(module, module_num)
                         
                         # Show lesson content if available
                         module_id = module.get('module_id')
-                        # Handle both int and string module_id
-                        module_lessons = [
-                            l for l in content_data 
-                            if (l.get('module_id') == module_id or 
-                                str(l.get('module_id')) == str(module_id) or
-                                int(l.get('module_id', 0)) == int(module_id))
-                        ]
+                        module_lessons = lessons_by_module.get(str(module_id), [])
                         
                         if module_lessons:
                             st.markdown("### 📚 Full Lesson Content")
                             st.info(f"📖 {len(module_lessons)} lesson(s) available for this module. Click to expand and view full content.")
+                            # Collapsed expander bodies still render on every
+                            # run, so the heavy lesson markdown is deferred
+                            # behind a load button and only lessons the user
+                            # actually opened pay the rendering cost.
+                            open_lessons = st.session_state.setdefault('_open_lessons', set())
                             for lesson in module_lessons:
                                 lesson_name = lesson.get('lesson_name', lesson.get('title', 'Untitled Lesson'))
                                 lesson_id = lesson.get('lesson_id', '')
-                                # Find transcript for this lesson
-                                transcript = None
-                                for key, t in transcript_map.items():
-                                    mod_id, lid, lname = key
-                                    if (mod_id == module_id and 
-                                        (lid == lesson_id or lname == lesson_name)):
-                                        transcript = t
-                                        break
+                                lesson_key = f"{module_id}:{lesson_id or lesson_name}"
                                 
                                 with st.expander(f"📖 {lesson_name}", expanded=False):
-                                    display_lesson_content(lesson, transcript)
+                                    if lesson_key in open_lessons:
+                                        # Find transcript for this lesson
+                                        transcript = None
+                                        for key, t in transcript_map.items():
+                                            mod_id, lid, lname = key
+                                            if (mod_id == module_id and 
+                                                (lid == lesson_id or lname == lesson_name)):
+                                                transcript = t
+                                                break
+                                        display_lesson_content(lesson, transcript)
+                                    elif st.button("Load lesson content", key=f"load_{lesson_key}"):
+                                        open_lessons.add(lesson_key)
+                                        st.rerun()
                         elif content_data:
-                            st.warning(f"⚠️ No lesson content found for Module {module_id}. Available lessons have module_ids: {list(set([l.get('module_id') for l in content_data[:10]]))}")
+                            st.warning(f"⚠️ No lesson content found for Module {module_id}. Available lessons have module_ids: {available_module_ids}")
                         else:
                             st.info("⏳ Lesson content is being generated. Please wait...")
                         
@@ -2,42 +2,134 @@
 
 from __future__ import annotations
 
+import html
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
 import requests
 import streamlit as st
 from streamlit_autorefresh import st_autorefresh
 
+# orjson decodes the dict-heavy API payloads 2-5x faster than the
+# stdlib parser; fall back transparently when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 API_BASE_URL = os.environ.get("COURSE_CHAT_API_URL", "http://localhost:8000/api")
 
+# Reruns caused by typing or widget interaction reuse responses younger
+# than this instead of re-issuing the HTTP round trip.
+_FETCH_MIN_INTERVAL = 2.0
+
 
 def _api_url(path: str) -> str:
     return f"{API_BASE_URL}{path}"
 
 
+def _parse(response: requests.Response) -> Dict[str, Any]:
+    """Decode a JSON response straight from its raw bytes."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# One keep-alive session per server process: connections to the API are
+# pooled and reused across reruns instead of paying a TCP handshake (and
+# FD churn) for every polling tick and chat action.
+@st.cache_resource(show_spinner=False)
+def _http() -> requests.Session:
+    return requests.Session()
+
+
+# Three workers, one per polling endpoint
+@st.cache_resource(show_spinner=False)
+def _fetch_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=3, thread_name_prefix="chat-fetch")
+
+
+def _drop_fetch_cache() -> None:
+    """Invalidate cached fetches after an action that changes server state."""
+    st.session_state.pop("_refresh_entry", None)
+
+
+def _fetch_one(http: requests.Session, cache: Dict[str, Any], spec) -> Optional[Dict[str, Any]]:
+    """
+    One conditional GET with If-None-Match against the API's ETag support.
+
+    A 304 serves the previously parsed body straight from the cache, so
+    unchanged polling responses cost a header exchange rather than a
+    full JSON download and re-parse. Returns None on 404. Takes the
+    session and cache as plain arguments so it can run on a worker
+    thread without touching st.session_state.
+    """
+    key, path, params = spec
+    entry = cache.get(key)
+    headers = {"If-None-Match": entry[0]} if entry else None
+    response = http.get(_api_url(path), params=params, headers=headers, timeout=10)
+    if response.status_code == 304 and entry:
+        return entry[1]
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    body = _parse(response)
+    etag = response.headers.get("ETag")
+    if etag:
+        cache[key] = (etag, body)
+    return body
+
+
+def _refresh_data():
+    """
+    Fetch session state, progress, and artifacts for this tick.
+
+    The three reads are independent, so they go out concurrently and the
+    refresh costs one round trip instead of three back-to-back; results
+    younger than the throttle interval are reused outright.
+    """
+    session_id = st.session_state.get("chat_session_id")
+    if not session_id:
+        return None, {}, {}
+
+    now = time.monotonic()
+    entry = st.session_state.get("_refresh_entry")
+    if entry is not None and now - entry[0] < _FETCH_MIN_INTERVAL:
+        return entry[1]
+
+    cache = st.session_state.setdefault("_http_cache", {})
+    http = _http()
+    specs = (
+        (f"session:{session_id}", f"/sessions/{session_id}", None),
+        (f"progress:{session_id}", f"/sessions/{session_id}/progress", {"full": "true"}),
+        (f"artifacts:{session_id}", f"/sessions/{session_id}/artifacts", None),
+    )
+    session_body, progress_body, artifacts_body = _fetch_pool().map(
+        lambda spec: _fetch_one(http, cache, spec), specs
+    )
+    data = (
+        session_body,
+        progress_body or {},
+        (artifacts_body or {}).get("artifacts", {}),
+    )
+    st.session_state._refresh_entry = (now, data)
+    return data
+
+
 def ensure_session() -> None:
     if "chat_session_id" in st.session_state:
         return
     title = st.session_state.get("chat_session_title") or "AI Course Builder Session"
-    response = requests.post(_api_url("/sessions"), json={"title": title}, timeout=10)
+    response = _http().post(_api_url("/sessions"), json={"title": title}, timeout=10)
     response.raise_for_status()
-    data = response.json()
+    data = _parse(response)
     st.session_state.chat_session_id = data["session_id"]
     st.session_state.chat_thread_id = data["thread_id"]
 
 
-def fetch_session_state() -> Optional[Dict[str, Any]]:
-    session_id = st.session_state.get("chat_session_id")
-    if not session_id:
-        return None
-    response = requests.get(_api_url(f"/sessions/{session_id}"), timeout=10)
-    response.raise_for_status()
-    return response.json()
-
-
 def send_message(message: str, action: Optional[str] = None, course_config: Optional[Dict[str, Any]] = None):
     session_id = st.session_state.get("chat_session_id")
     if not session_id:
@@ -49,46 +141,57 @@ def send_message(message: str, action: Optional[str] = None, course_config: Opti
     if course_config:
         payload["course_config"] = course_config
 
-    response = requests.post(
+    response = _http().post(
         _api_url(f"/sessions/{session_id}/messages"),
         json=payload,
         timeout=30,
     )
     response.raise_for_status()
-    st.session_state.last_session_state = response.json()
+    st.session_state.last_session_state = _parse(response)
 
 
-def fetch_progress() -> Dict[str, Any]:
-    session_id = st.session_state.get("chat_session_id")
-    if not session_id:
-        return {}
-    response = requests.get(_api_url(f"/sessions/{session_id}/progress"), timeout=10)
-    if response.status_code == 404:
-        return {}
-    response.raise_for_status()
-    return response.json()
-
-
-def fetch_artifacts() -> Dict[str, Any]:
-    session_id = st.session_state.get("chat_session_id")
-    if not session_id:
-        return {}
-    response = requests.get(_api_url(f"/sessions/{session_id}/artifacts"), timeout=10)
-    if response.status_code == 404:
-        return {}
-    response.raise_for_status()
-    return response.json().get("artifacts", {})
+# Styles for the batched history bubbles, shipped once per render
+_BUBBLE_CSS = (
+    "<style>"
+    ".cb-msg{margin:0.25rem 0;display:flex}"
+    ".cb-msg.user{justify-content:flex-end}"
+    ".cb-bubble{max-width:85%;padding:0.5rem 0.85rem;border-radius:12px;"
+    "white-space:pre-wrap;background:#f0f2f6;color:#202124}"
+    ".cb-msg.user .cb-bubble{background:#1a73e8;color:white}"
+    ".cb-msg.system .cb-bubble{background:#e8f0fe;color:#174ea6;font-size:0.9rem}"
+    "</style>"
+)
 
 
 def render_messages(session_state: Dict[str, Any]) -> None:
+    """
+    Render the conversation: history as one batched HTML element,
+    a real st.chat_message only for the newest entry.
+
+    Each st.chat_message used to add two elements per turn, so long
+    conversations re-shipped hundreds of elements on every polling tick.
+    The settled history is static text - simple styled bubbles carry the
+    same information in a single markdown element.
+    """
     st.subheader("Conversation")
-    for msg in session_state.get("messages", []):
-        role = msg["role"]
-        if role == "system":
-            st.info(msg["content"])
-            continue
-        with st.chat_message(role):
-            st.write(msg["content"])
+    messages = session_state.get("messages", [])
+    if not messages:
+        return
+    if len(messages) > 1:
+        bubbles = [_BUBBLE_CSS]
+        for msg in messages[:-1]:
+            role = msg["role"]
+            content = html.escape(msg["content"])
+            bubbles.append(
+                f'<div class="cb-msg {role}"><div class="cb-bubble">{content}</div></div>'
+            )
+        st.markdown("".join(bubbles), unsafe_allow_html=True)
+    last = messages[-1]
+    if last["role"] == "system":
+        st.info(last["content"])
+    else:
+        with st.chat_message(last["role"]):
+            st.write(last["content"])
 
 
 def render_progress(progress_data: Dict[str, Any]) -> None:
@@ -97,17 +200,30 @@ def render_progress(progress_data: Dict[str, Any]) -> None:
     if not steps:
         st.info("No workflow activity yet.")
         return
-    for step in reversed(steps[-8:]):
-        st.write(f"{step['timestamp']} — **{step['step']}** {step['status']}")
+    # One plain-text element for the whole log: st.text skips the
+    # markdown parse that st.write ran for every row
+    st.text("\n".join(
+        f"{step['timestamp']}  {step['step']}  {step['status']}"
+        for step in reversed(steps[-8:])
+    ))
 
 
 def render_artifacts(artifacts: Dict[str, Any]) -> None:
+    """
+    List artifacts as cheap toggles; serialize only the opened ones.
+
+    st.json shipped every artifact's full payload across the websocket
+    on each polling tick, opened or not. A checkbox per key costs a few
+    bytes, and only payloads the user has actually toggled open are
+    sent - checkbox state persists across reruns, so open artifacts
+    stay open.
+    """
     st.subheader("Artifacts")
     if not artifacts:
         st.info("No artifacts available yet.")
         return
     for key, value in artifacts.items():
-        with st.expander(key, expanded=False):
+        if st.checkbox(f"▸ {key}", key=f"art_{key}"):
             st.json(value)
 
 
@@ -144,9 +260,16 @@ def main() -> None:
     st.caption("Chat-native front door for the LangGraph workflow.")
 
     ensure_session()
-    st_autorefresh(interval=15_000, key="chat_auto_refresh")
 
-    latest_state = fetch_session_state()
+    # Adaptive cadence: poll fast only while the workflow is actually
+    # running (judged from the previous tick's progress), back off when
+    # the session is idle
+    entry = st.session_state.get("_refresh_entry")
+    last_step = entry[1][1].get("last_step") if entry else None
+    running = bool(last_step) and last_step.get("status") not in ("completed", "failed")
+    st_autorefresh(interval=5_000 if running else 30_000, key="chat_auto_refresh")
+
+    latest_state, progress_data, artifacts = _refresh_data()
     if latest_state:
         st.session_state.last_session_state = latest_state
 
@@ -162,8 +285,10 @@ def main() -> None:
         prompt = st.chat_input("Send a message to the assistant")
         if prompt:
             send_message(prompt)
-            time.sleep(0.2)
-            st.experimental_rerun()
+            # Rerun immediately - the old 200ms sleep blocked the script
+            # thread for nothing - and refetch fresh state
+            _drop_fetch_cache()
+            st.rerun()
 
     with col2:
         config_data = sidebar_form()
@@ -174,12 +299,10 @@ def main() -> None:
                 course_config=config_data,
             )
             st.success("Workflow launched with the provided configuration.")
-            st.experimental_rerun()
+            _drop_fetch_cache()
+            st.rerun()
 
-        progress_data = fetch_progress()
         render_progress(progress_data)
-
-        artifacts = fetch_artifacts()
         render_artifacts(artifacts)
 
 
@@ -232,7 +232,7 @@ def calculate_workflow_progress(thread_id: str) -> Dict[str, Any]:
             "steps": List[Dict]  # List of all steps with their status
         }
     """
-    from utils.results_saver import ResultsSaver
+    from utils.results_saver import get_saver
     
     steps = read_progress_file(thread_id)
     
@@ -249,7 +249,7 @@ def calculate_workflow_progress(thread_id: str) -> Dict[str, Any]:
         }
     
     # Check for active interrupts (Case 3: Multiple Interrupts)
-    saver = ResultsSaver()
+    saver = get_saver()
     interrupt_structure = saver.get_latest_result("interrupt_structure", thread_id)
     interrupt_content = saver.get_latest_result("interrupt_content", thread_id)
     interrupt_quizzes = saver.get_latest_result("interrupt_quizzes", thread_id)
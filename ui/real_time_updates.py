@@ -4,15 +4,30 @@ import os
 import time
 from typing import Dict, Any, Optional, List
 import streamlit as st
-from utils.results_saver import ResultsSaver
+from utils.results_saver import get_saver
+
+_WAITING = {"status": "waiting", "step": None, "message": "Waiting for workflow to start..."}
+
+# thread_id -> ((mtime_ns, size), parsed status). The polling tick hits
+# this every 2 seconds; when the progress file's fingerprint hasn't
+# moved, the call costs one stat instead of re-reading and re-parsing
+# the whole JSONL file.
+_status_cache: Dict[str, tuple] = {}
 
 
 def get_current_step_status(thread_id: str) -> Dict[str, Any]:
     """Get current step status from progress file."""
     progress_file = os.path.join("course_outputs", f"{thread_id}_progress.jsonl")
     
-    if not os.path.exists(progress_file):
-        return {"status": "waiting", "step": None, "message": "Waiting for workflow to start..."}
+    try:
+        stat_result = os.stat(progress_file)
+    except OSError:
+        return _WAITING
+    
+    sig = (stat_result.st_mtime_ns, stat_result.st_size)
+    cached = _status_cache.get(thread_id)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
     
     steps = []
     try:
@@ -27,7 +42,7 @@ def get_current_step_status(thread_id: str) -> Dict[str, Any]:
         pass
     
     if not steps:
-        return {"status": "waiting", "step": None, "message": "Waiting for workflow to start..."}
+        return _WAITING
     
     # Get latest step
     latest = steps[-1]
@@ -43,12 +58,14 @@ def get_current_step_status(thread_id: str) -> Dict[str, Any]:
         status = latest.get("status", "unknown")
         details = latest.get("details", {})
     
-    return {
+    status_info = {
         "status": status,
         "step": step_name,
         "details": details,
         "message": _get_step_message(step_name, status, details)
     }
+    _status_cache[thread_id] = (sig, status_info)
+    return status_info
 
 
 def _get_step_message(step_name: str, status: str, details: Dict[str, Any]) -> str:
@@ -106,7 +123,7 @@ def _get_step_message(step_name: str, status: str, details: Dict[str, Any]) -> s
 
 def check_content_available(thread_id: str) -> Dict[str, Any]:
     """Check what content is available to display."""
-    saver = ResultsSaver()
+    saver = get_saver()
     available = {
         "module_structure": False,
         "xdp_content": False,
@@ -183,22 +200,42 @@ def display_step_progress(thread_id: str, container):
     return True  # Message is showing
 
 
+# (source object, rendered markdown) for the module-structure block.
+# The parsed dict's identity is stable between ticks while the file is
+# unchanged (the saver caches by mtime), so the O(modules) string build
+# runs once per structure version rather than every 2 seconds.
+_structure_block: tuple = (None, "")
+
+
+def _structure_markdown(structure: Dict[str, Any]) -> str:
+    """Render the module-structure summary, reusing the frozen block."""
+    global _structure_block
+    source, text = _structure_block
+    if source is structure:
+        return text
+    modules = structure["data"]["modules"]
+    lines = [f"**Total Modules:** {len(modules)}"]
+    for i, module in enumerate(modules, 1):
+        lines.append(f"**Module {i}:** {module.get('module_name', 'N/A')}")
+        lessons = module.get("lessons", [])
+        if lessons:
+            lines.append(f"<small>{len(lessons)} lessons planned</small>")
+    text = "\n\n".join(lines)
+    _structure_block = (structure, text)
+    return text
+
+
 def display_content_as_ready(thread_id: str, st_container):
     """Display content as it becomes available."""
-    saver = ResultsSaver()
+    saver = get_saver()
     
-    # Module Structure
+    # Module Structure: one markdown element for the whole module list
+    # instead of one element per module line, built from the cached block
     structure = saver.get_latest_result("module_structure", thread_id)
     if structure and structure.get("data", {}).get("modules"):
-        modules = structure["data"]["modules"]
         with st_container:
             st.success("✅ **Module Structure Created**")
-            st.markdown(f"**Total Modules:** {len(modules)}")
-            for i, module in enumerate(modules, 1):
-                st.markdown(f"**Module {i}:** {module.get('module_name', 'N/A')}")
-                lessons = module.get("lessons", [])
-                if lessons:
-                    st.caption(f"  {len(lessons)} lessons planned")
+            st.markdown(_structure_markdown(structure), unsafe_allow_html=True)
     
     # XDP Content
     xdp = saver.get_latest_result("xdp_content", thread_id)
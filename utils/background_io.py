@@ -0,0 +1,37 @@
+"""Background executor for deferring result-file writes off the critical path."""
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+
+# Writes are small JSON files and strictly I/O bound, so a handful of
+# threads lets the finalization fan-out (research/modules/xdp/content/
+# quizzes/final course) overlap instead of landing serially. Read from
+# the environment directly so utils stays independent of services.config,
+# which exposes the same knob as workflow_write_concurrency.
+_MAX_WORKERS = int(os.environ.get("COURSE_APP_WORKFLOW_WRITE_CONCURRENCY", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="results-io")
+_pending: Dict[str, List[Future]] = defaultdict(list)
+_lock = threading.Lock()
+
+
+def schedule_save(thread_id: str, save_func: Callable, *args) -> Future:
+    """
+    Run a save function in the background so the calling agent can return
+    without waiting for the disk flush. The future is tracked per thread_id
+    so the finalizer can drain outstanding writes before compiling output.
+    """
+    future = _executor.submit(save_func, *args)
+    with _lock:
+        _pending[thread_id].append(future)
+    return future
+
+
+def wait_for_saves(thread_id: str, timeout: float = 30.0) -> None:
+    """Block until all background saves for this thread_id have completed."""
+    with _lock:
+        futures = _pending.pop(thread_id, [])
+    if futures:
+        wait(futures, timeout=timeout)
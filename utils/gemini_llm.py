@@ -1,10 +1,19 @@
 """Utility for using Google Gemini with LangChain compatibility."""
+import functools
 import google.generativeai as genai
 from typing import List, Optional, Any, Iterator
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
-from langchain_core.outputs import ChatGeneration, ChatResult
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, AIMessageChunk, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+
+# Local tokenizer for length estimates - Gemini's count_tokens() is a remote
+# call, which is far too slow for per-prompt size checks.
+try:
+    import tiktoken
+    _TOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _TOKEN_ENCODING = None
 
 
 class GeminiLLM(BaseChatModel):
@@ -13,15 +22,31 @@ class GeminiLLM(BaseChatModel):
     model: str = "gemini-1.5-pro"
     api_key: str = None
     temperature: float = 0.7
-    
-    def __init__(self, model: str = "gemini-1.5-pro", api_key: str = None, temperature: float = 0.7, **kwargs):
+    response_mime_type: Optional[str] = None
+    response_schema: Optional[Any] = None
+
+    def __init__(self, model: str = "gemini-1.5-pro", api_key: str = None, temperature: float = 0.7,
+                 response_mime_type: Optional[str] = None, response_schema: Optional[Any] = None,
+                 **kwargs):
         super().__init__(**kwargs)
         self.model = model
         self.api_key = api_key
         self.temperature = temperature
+        self.response_mime_type = response_mime_type
+        self.response_schema = response_schema
         if api_key:
             genai.configure(api_key=api_key)
         self._client = None
+
+    def _generation_config(self) -> "genai.types.GenerationConfig":
+        """Build the generation config, requesting structured output when configured."""
+        config = {"temperature": self.temperature}
+        if self.response_mime_type:
+            config["response_mime_type"] = self.response_mime_type
+        if self.response_schema is not None:
+            # Schema-constrained decoding guarantees a parseable JSON body
+            config["response_schema"] = self.response_schema
+        return genai.types.GenerationConfig(**config)
     
     @property
     def client(self):
@@ -42,12 +67,30 @@ class GeminiLLM(BaseChatModel):
         try:
             response = self.client.generate_content(
                 prompt,
-                generation_config=genai.types.GenerationConfig(temperature=self.temperature)
+                generation_config=self._generation_config()
             )
             return self._create_result(response)
         except Exception as e:
             raise Exception(f"Gemini API error: {str(e)}")
     
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Generate response from messages without blocking the event loop."""
+        prompt = self._format_messages(messages)
+        try:
+            response = await self.client.generate_content_async(
+                prompt,
+                generation_config=self._generation_config()
+            )
+            return self._create_result(response)
+        except Exception as e:
+            raise Exception(f"Gemini API error: {str(e)}")
+
     def _format_messages(self, messages: List[BaseMessage]) -> str:
         """Convert LangChain messages to text prompt."""
         parts = []
@@ -73,6 +116,19 @@ class GeminiLLM(BaseChatModel):
         generation = ChatGeneration(message=message)
         return ChatResult(generations=[generation])
     
+    def get_num_tokens(self, text: str) -> int:
+        """
+        Estimate token count locally.
+
+        Deliberately avoids model.count_tokens(), which performs an HTTP
+        round-trip per call; an approximate local count is enough for
+        prompt-size guards. Falls back to a chars/4 heuristic if tiktoken
+        is unavailable.
+        """
+        if _TOKEN_ENCODING is not None:
+            return len(_TOKEN_ENCODING.encode(text))
+        return max(1, len(text) // 4)
+
     @property
     def _llm_type(self) -> str:
         return "gemini"
@@ -88,3 +144,47 @@ class GeminiLLM(BaseChatModel):
         result = self._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
         yield result.generations[0]
 
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ):
+        """Stream response chunks as they arrive from Gemini."""
+        prompt = self._format_messages(messages)
+        try:
+            response = await self.client.generate_content_async(
+                prompt,
+                generation_config=self._generation_config(),
+                stream=True
+            )
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except Exception:
+                    continue
+                if text:
+                    yield ChatGenerationChunk(message=AIMessageChunk(content=text))
+        except Exception as e:
+            raise Exception(f"Gemini API error: {str(e)}")
+
+
+@functools.lru_cache(maxsize=8)
+def get_llm(model: str, api_key: str, temperature: float,
+            response_mime_type: Optional[str] = None,
+            response_schema: Optional[Any] = None) -> GeminiLLM:
+    """
+    Return a shared GeminiLLM for this configuration.
+
+    Agents call this instead of constructing GeminiLLM per invocation, so
+    client initialization happens once per configuration and the underlying
+    HTTP connection pool is reused across calls.
+    """
+    return GeminiLLM(
+        model=model,
+        api_key=api_key,
+        temperature=temperature,
+        response_mime_type=response_mime_type,
+        response_schema=response_schema
+    )
@@ -0,0 +1,61 @@
+"""Utility for extracting and parsing JSON from LLM response text."""
+import json
+from typing import Any, Optional
+
+# orjson parses and serializes several times faster than stdlib json, which
+# matters for megabyte-scale LLM payloads; fall back to stdlib if missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: str) -> Any:
+    """Parse JSON using orjson when available. Raises ValueError on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_compact(obj: Any) -> str:
+    """Serialize to compact JSON using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def first_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced top-level JSON object in text, or None.
+
+    Scans linearly from the first '{', tracking brace depth while skipping
+    string literals and escape sequences. This avoids the O(n^2) behavior of
+    greedy regex extraction on large or malformed LLM outputs.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
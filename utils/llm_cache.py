@@ -0,0 +1,57 @@
+"""In-memory cache for LLM results keyed by a hash of the request inputs."""
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class LLMCache:
+    """
+    Bounded LRU cache for parsed LLM outputs.
+
+    Keys are derived from a stable hash of the input dict, so repeat runs
+    with identical inputs (common in dev/test) skip the Gemini round-trip
+    entirely. Values are deep-copied on get/put so cached results can't be
+    mutated by downstream state updates.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, inputs: Dict[str, Any]) -> str:
+        """Build a stable cache key from a namespace and input dict."""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{namespace}:{digest}"
+
+    def get(self, namespace: str, inputs: Dict[str, Any]) -> Optional[Any]:
+        """Return a cached result for these inputs, or None on miss."""
+        key = self.make_key(namespace, inputs)
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(self._entries[key])
+
+    def put(self, namespace: str, inputs: Dict[str, Any], value: Any) -> None:
+        """Store a result for these inputs, evicting the oldest entry if full."""
+        key = self.make_key(namespace, inputs)
+        with self._lock:
+            self._entries[key] = copy.deepcopy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared process-wide cache instance
+llm_cache = LLMCache()
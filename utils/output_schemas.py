@@ -3,6 +3,32 @@ from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 
 
+class ResearchFindings(BaseModel):
+    """Schema for research findings from researcher agent."""
+    key_areas: List[str]
+    topics: Dict[str, List[str]]
+    learning_objectives: List[str]
+    prerequisites: List[str] = Field(default_factory=list)
+    depth_mapping: Dict[str, str] = Field(default_factory=dict)
+
+
+class XDPDesignPattern(BaseModel):
+    """Schema for a per-module XDP design pattern."""
+    module_id: int
+    module_name: str
+    module_description: str
+    pattern_type: str
+    components: List[str]
+
+
+class XDPOutput(BaseModel):
+    """Schema for complete XDP specification output."""
+    xdp_specification: Dict[str, Any]
+    content_templates: Dict[str, Any]
+    design_patterns: List[XDPDesignPattern]
+    metadata: Dict[str, Any]
+
+
 class LessonStructure(BaseModel):
     """Schema for lesson structure in module."""
     lesson_name: str
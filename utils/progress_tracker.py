@@ -1,4 +1,5 @@
 """Progress tracker that streams updates to a file in real-time."""
+import functools
 import json
 import os
 from datetime import datetime
@@ -39,9 +40,10 @@ class ProgressTracker:
             "details": details or {}
         }
         
-        # Write as JSONL (one JSON object per line) for streaming
+        # Write as JSONL (one JSON object per line) for streaming.
+        # default=dict lets callers pass shared MappingProxyType payloads.
         with open(self.progress_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+            f.write(json.dumps(log_entry, ensure_ascii=False, default=dict) + "\n")
             f.flush()  # Force write to disk immediately
         
         # Also print to console
@@ -101,3 +103,13 @@ class ProgressTracker:
             "last_step": steps[-1] if steps else None
         }
 
+
+@functools.lru_cache(maxsize=128)
+def get_tracker(thread_id: str = "default", output_dir: str = "course_outputs") -> ProgressTracker:
+    """
+    Return a shared ProgressTracker for this thread_id.
+
+    Avoids re-creating the tracker (and re-running the output-dir mkdir)
+    in every agent that logs progress for the same workflow run.
+    """
+    return ProgressTracker(thread_id, output_dir)
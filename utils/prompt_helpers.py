@@ -104,3 +104,32 @@ def create_structured_parser(schema: Type[BaseModel], array: bool = False):
     
     return RunnableLambda(parse)
 
+
+async def astream_first_json(chain, inputs: Dict) -> str:
+    """
+    Stream a chain's response and return content as soon as a complete JSON
+    object has arrived, overlapping network transfer with parsing.
+
+    Re-scans the buffer only when it has doubled since the last attempt, so
+    large responses aren't re-parsed per chunk.
+    """
+    from utils.json_extract import first_json_object
+
+    parts: List[str] = []
+    length = 0
+    next_scan_at = 2048
+
+    async for chunk in chain.astream(inputs):
+        piece = chunk.content if hasattr(chunk, 'content') else str(chunk)
+        if not piece:
+            continue
+        parts.append(piece)
+        length += len(piece)
+        if length >= next_scan_at:
+            content = "".join(parts)
+            if first_json_object(content):
+                return content
+            parts = [content]
+            next_scan_at = length * 2
+
+    return "".join(parts)
@@ -1,9 +1,42 @@
 """Utility to save intermediate and final results from workflow steps."""
+import functools
+import hashlib
 import json
+import mmap
 import os
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+# orjson parses result files 3-10x faster than the stdlib decoder; fall
+# back transparently when it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Payloads above this are mapped instead of read, skipping the full
+# kernel-to-userspace copy before parsing.
+_MMAP_THRESHOLD = 64 * 1024
+
+# Parsed results kept in memory per saver; enough for every step of a
+# handful of concurrent threads without growing unboundedly.
+_READ_CACHE_MAX = 64
+
+
+def _parse_file(filepath: str, size: int):
+    """Read and parse one result file, mapping large payloads."""
+    with open(filepath, "rb") as f:
+        if size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if orjson is not None:
+                    return orjson.loads(memoryview(mm))
+                return json.loads(bytes(mm))
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class ResultsSaver:
     """Saves results from each workflow step to JSON files."""
@@ -11,12 +44,38 @@ class ResultsSaver:
     def __init__(self, output_dir: str = "course_outputs"):
         self.output_dir = output_dir
         self.ensure_output_dir()
+        # path -> (mtime_ns, parsed data), LRU-bounded; unchanged files
+        # are served from here instead of re-parsed per poll, and saves
+        # seed it so a save-then-read never touches the disk.
+        self._read_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # filename -> blake2b digest of the last payload written, so a
+        # replayed step saving identical data skips the disk entirely.
+        self._content_hashes: Dict[str, bytes] = {}
     
     def ensure_output_dir(self):
         """Create output directory if it doesn't exist."""
+        # Single stat in the common case; makedirs with exist_ok still
+        # walks the path and swallows EEXIST when the dir is present.
+        if os.path.isdir(self.output_dir):
+            return
         os.makedirs(self.output_dir, exist_ok=True)
+
+    def _cache_get(self, filepath: str, mtime_ns: int):
+        """Return the cached parse for this path if its mtime still matches."""
+        cached = self._read_cache.get(filepath)
+        if cached is None or cached[0] != mtime_ns:
+            return None
+        self._read_cache.move_to_end(filepath)
+        return cached[1]
+
+    def _cache_put(self, filepath: str, mtime_ns: int, data) -> None:
+        self._read_cache[filepath] = (mtime_ns, data)
+        self._read_cache.move_to_end(filepath)
+        if len(self._read_cache) > _READ_CACHE_MAX:
+            self._read_cache.popitem(last=False)
     
-    def save_step_result(self, step_name: str, data: Dict[str, Any], thread_id: str = "default"):
+    def save_step_result(self, step_name: str, data: Dict[str, Any], thread_id: str = "default",
+                         pretty: bool = True):
         """
         Save result from a workflow step.
         Uses fixed filename that gets overwritten on each run.
@@ -25,11 +84,28 @@ class ResultsSaver:
             step_name: Name of the step (e.g., "research_findings", "module_structure")
             data: Data to save
             thread_id: Thread ID for this workflow run
+            pretty: Indent the JSON for human readers; pass False to
+                roughly halve the bytes written for machine-only files
         """
         # Use fixed filename without timestamp - will overwrite on each run
         filename = f"{thread_id}_{step_name}.json"
         filepath = os.path.join(self.output_dir, filename)
         
+        # Hash the payload alone (the envelope's timestamp changes every
+        # call); a retried or replayed step that produces bit-identical
+        # data becomes a no-op instead of a serialize+write.
+        if orjson is not None:
+            data_bytes = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS, default=str)
+        else:
+            data_bytes = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+        digest = hashlib.blake2b(data_bytes, digest_size=16).digest()
+        # The existence check keeps the skip honest when clear_previous_run
+        # has deleted the file since our last write: the shared saver's
+        # hashes outlive runs, and a rerun producing identical bytes must
+        # still materialize the artifact on disk.
+        if self._content_hashes.get(filename) == digest and os.path.exists(filepath):
+            return filepath
+        
         result = {
             "step_name": step_name,
             "thread_id": thread_id,
@@ -37,8 +113,23 @@ class ResultsSaver:
             "data": data
         }
         
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        # Encode with orjson when available, then write to a sidecar and
+        # rename over the target: os.replace is atomic, so pollers never
+        # see a half-written file mid-overwrite.
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            body = orjson.dumps(result, option=option, default=str)
+        else:
+            body = json.dumps(result, indent=2 if pretty else None,
+                              ensure_ascii=False, default=str).encode("utf-8")
+        tmp = filepath + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, filepath)
+        self._content_hashes[filename] = digest
+        # Seed the read cache with the envelope we just built, so the
+        # usual save-then-poll sequence skips the read-back parse.
+        self._cache_put(filepath, os.stat(filepath).st_mtime_ns, result)
         
         print(f"💾 Saved {step_name} to: {filepath}")
         return filepath
@@ -57,7 +148,64 @@ class ResultsSaver:
     
     def save_course_content(self, content: list, thread_id: str = "default"):
         """Save course content from course_content_agent."""
-        return self.save_step_result("course_content", {"lessons": content}, thread_id)
+        # Largest payload of the workflow: stream it item by item
+        return self._save_streaming_list("course_content", "lessons", content, thread_id)
+
+    def _save_streaming_list(self, step_name: str, list_key: str, items: list,
+                             thread_id: str = "default"):
+        """
+        Save a large list payload without building the whole document in
+        memory: each item is encoded and appended separately, so peak
+        memory is one item rather than the full course. The content hash
+        accumulates incrementally; when it matches the last write, the
+        sidecar is discarded instead of renamed, which also keeps the
+        file's mtime (and every mtime-keyed reader cache) stable.
+        """
+        filename = f"{thread_id}_{step_name}.json"
+        filepath = os.path.join(self.output_dir, filename)
+
+        def encode(obj) -> bytes:
+            if orjson is not None:
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=str)
+            return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+
+        timestamp = datetime.now().isoformat()
+        header = (
+            '{"step_name":' + json.dumps(step_name)
+            + ',"thread_id":' + json.dumps(thread_id)
+            + ',"timestamp":' + json.dumps(timestamp)
+            + ',"data":{' + json.dumps(list_key) + ':['
+        ).encode("utf-8")
+
+        running_hash = hashlib.blake2b(digest_size=16)
+        tmp = filepath + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(header)
+            for i, item in enumerate(items):
+                body = encode(item)
+                running_hash.update(body)
+                if i:
+                    f.write(b",")
+                f.write(body)
+            f.write(b"]}}")
+
+        digest = running_hash.digest()
+        # Same existence guard as save_step_result: never skip the rename
+        # when the previous artifact has been cleared from disk.
+        if self._content_hashes.get(filename) == digest and os.path.exists(filepath):
+            os.unlink(tmp)
+            return filepath
+        os.replace(tmp, filepath)
+        self._content_hashes[filename] = digest
+        self._cache_put(filepath, os.stat(filepath).st_mtime_ns, {
+            "step_name": step_name,
+            "thread_id": thread_id,
+            "timestamp": timestamp,
+            "data": {list_key: items},
+        })
+
+        print(f"💾 Saved {step_name} to: {filepath}")
+        return filepath
     
     def save_quizzes(self, quizzes: list, thread_id: str = "default"):
         """Save quizzes from quiz_curator_agent."""
@@ -83,13 +231,57 @@ class ResultsSaver:
     
     def get_latest_result(self, step_name: str, thread_id: str = "default") -> Optional[Dict]:
         """Get the latest saved result for a step."""
-        # With fixed filenames, just read the file directly
+        # With fixed filenames, just read the file directly. One stat
+        # doubles as the existence probe and the cache key; a file whose
+        # mtime hasn't moved is served from the in-process cache.
         filename = f"{thread_id}_{step_name}.json"
         filepath = os.path.join(self.output_dir, filename)
         
-        if not os.path.exists(filepath):
+        try:
+            stat = os.stat(filepath)
+        except OSError:
             return None
         
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        if (cached := self._cache_get(filepath, stat.st_mtime_ns)) is not None:
+            return cached
+        data = _parse_file(filepath, stat.st_size)
+        self._cache_put(filepath, stat.st_mtime_ns, data)
+        return data
+    
+    def get_latest_results(self, step_names: List[str], thread_id: str = "default") -> Dict[str, Dict]:
+        """
+        Load the latest results for several steps with one directory scan.
+        
+        A single os.scandir replaces an exists+open probe per step, and
+        files whose mtime hasn't moved since the previous call come from
+        the in-process cache instead of being re-read and re-parsed.
+        """
+        wanted = {f"{thread_id}_{step}.json": step for step in step_names}
+        results: Dict[str, Dict] = {}
+        try:
+            it = os.scandir(self.output_dir)
+        except FileNotFoundError:
+            return results
+        with it:
+            for entry in it:
+                step = wanted.get(entry.name)
+                if step is None:
+                    continue
+                stat = entry.stat()
+                if (cached := self._cache_get(entry.path, stat.st_mtime_ns)) is not None:
+                    results[step] = cached
+                    continue
+                data = _parse_file(entry.path, stat.st_size)
+                self._cache_put(entry.path, stat.st_mtime_ns, data)
+                results[step] = data
+        return results
+
+
+@functools.lru_cache(maxsize=8)
+def get_saver(output_dir: str = "course_outputs") -> ResultsSaver:
+    """
+    Return a shared ResultsSaver for this output directory.
 
+    Avoids repeating directory-existence syscalls on every agent call.
+    """
+    return ResultsSaver(output_dir)